@@ -18,11 +18,12 @@ Configuration:
     n_pitch: Number of points sampled on the sphere (default: 100)
     n_spin: Number of rotational positions at each point (default: 20)
     total_frames: Total animation frames (n_pitch * n_spin)
+    keyframe_interpolation: Interpolation enum value written to every keyframe (default: 1, LINEAR)
 """
 
 import bpy
 import math
-from mathutils import Vector, Quaternion
+import numpy as np
 
 # Settings
 obj = bpy.data.objects["oreo_biscuit"]
@@ -33,11 +34,10 @@ obj.rotation_mode = 'QUATERNION'
 n_pitch = 100  # Points on the sphere
 n_spin = 20    # Spins per orientation
 total_frames = n_pitch * n_spin
+keyframe_interpolation = 1  # foreach_set enum value of 'LINEAR' (0 = 'CONSTANT', 2 = 'BEZIER')
 bpy.context.scene.frame_start = 1
 bpy.context.scene.frame_end = total_frames
 
-frame = 0
-
 def fibonacci_sphere(samples):
     """
     Generates points evenly distributed on a unit sphere using the Fibonacci spiral method.
@@ -50,56 +50,129 @@ def fibonacci_sphere(samples):
         samples (int): The number of points to generate on the sphere
         
     Returns:
-        list: A list of Vector objects representing 3D points on a unit sphere
+        numpy.ndarray: An (samples, 3) array of 3D points on a unit sphere
         
     Note:
         The algorithm is based on the golden angle (phi) which provides optimal spacing
-        between points on a sphere.
+        between points on a sphere. Each point sits at the center of one of `samples`
+        equal-area latitude bands, so no two points land exactly on the poles.
     """
-    points = []
     phi = math.pi * (3. - math.sqrt(5.))  # golden angle
-    for i in range(samples):
-        y = 1 - (i / float(samples - 1)) * 2  # y from 1 to -1
-        radius = math.sqrt(1 - y * y)
-        theta = phi * i
-        x = math.cos(theta) * radius
-        z = math.sin(theta) * radius
-        points.append(Vector((x, y, z)))
-    return points
+    i = np.arange(samples)
+    y = 1 - (2 * i + 1) / samples  # equal-area bands, offset half a band from the poles
+    radius = np.sqrt(1 - y * y)
+    theta = phi * i
+    x = np.cos(theta) * radius
+    z = np.sin(theta) * radius
+    return np.stack([x, y, z], axis=1)
+
+def base_quaternions(directions):
+    """
+    Computes the rotations that map the +Z axis onto each direction in one batched pass.
+    
+    Uses the closed-form shortest-arc quaternion q = (1 + u.d, u x d) / |q| with u = (0, 0, 1),
+    which avoids per-direction cross/angle/Quaternion calls.
+    
+    Args:
+        directions (numpy.ndarray): An (N, 3) array of unit direction vectors
+        
+    Returns:
+        numpy.ndarray: An (N, 4) array of unit quaternions in (w, x, y, z) order
+        
+    Note:
+        Directions antipodal to +Z have no unique shortest arc; a half turn about
+        the X axis is used for them instead.
+    """
+    w = 1 + directions[:, 2]  # up . dir
+    quats = np.stack([w, -directions[:, 1], directions[:, 0], np.zeros_like(w)], axis=1)
+    norms = np.linalg.norm(quats, axis=1, keepdims=True)
+
+    antipodal = norms[:, 0] < 1e-9
+    quats[antipodal] = (0.0, 1.0, 0.0, 0.0)
+    norms[antipodal] = 1.0
+    return quats / norms
+
+def compose_spins(base_quats, cos_half, sin_half):
+    """
+    Composes a base rotation with spins about the direction it maps +Z onto.
+    
+    Because each base rotation maps +Z onto the direction, a spin about that direction applied
+    after it equals a spin about +Z applied before it. The product base @ (c, 0, 0, s)
+    then reduces to a handful of scalar multiplies per spin, without building axis-angle
+    quaternions.
+    
+    Args:
+        base_quats (numpy.ndarray): An (N, 4) array of base quaternions in (w, x, y, z) order
+        cos_half (numpy.ndarray): An (n_spin,) table of half spin angle cosines
+        sin_half (numpy.ndarray): An (n_spin,) table of half spin angle sines
+        
+    Returns:
+        numpy.ndarray: An (N, n_spin, 4) array of composed quaternions
+    """
+    w, x, y, z = (c[:, None] for c in base_quats.T)
+    return np.stack([
+        w * cos_half - z * sin_half,
+        x * cos_half + y * sin_half,
+        y * cos_half - x * sin_half,
+        z * cos_half + w * sin_half,
+    ], axis=-1)
+
+def insert_keyframes(obj, data_path, frames, values):
+    """
+    Bulk-inserts keyframes for every component of an object property.
+    
+    Instead of one keyframe_insert() call per frame, each component gets its own
+    FCurve whose keyframe points are allocated once and filled with foreach_set(),
+    including their interpolation (keyframe_interpolation).
+    
+    Args:
+        obj: Blender object to animate
+        data_path (str): Animated property path (e.g. "rotation_quaternion")
+        frames (numpy.ndarray): A (F,) array of frame numbers
+        values (numpy.ndarray): An (F, C) array of property values, one column per component
+    """
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    action = obj.animation_data.action
+
+    count = len(frames)
+    co = np.empty(2 * count, dtype=np.float32)
+    co[0::2] = frames
+    interpolation = np.full(count, keyframe_interpolation, dtype=np.int32)
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.new(data_path, index=index)
+        fcurve.keyframe_points.add(count)
+        co[1::2] = values[:, index]
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.keyframe_points.foreach_set("interpolation", interpolation)
+        fcurve.update()
 
 def main():
     """
     Executes the rotation animation logic:
 
     1. Gets points distributed evenly on a sphere using fibonacci_sphere()
-    2. For each point (direction vector):
-    - Computes a base quaternion rotation that points the object in that direction
-    - For each spin position:
-        - Applies additional rotation around the direction vector
-        - Combines rotations and creates a keyframe
-        - Increments the frame counter
+    2. Computes the base quaternion rotation of every direction (base_quaternions())
+    3. Combines each base rotation with the spin rotations around its direction for
+       all spin positions in closed form (compose_spins()), using one shared
+       sin/cos table of the spin angles
+    4. Writes all combined rotations as keyframes in one bulk pass (insert_keyframes())
 
     The result is a sequence of keyframes that show the object from every possible viewpoint,
     with a total of n_pitch * n_spin unique orientations.
     """
     directions = fibonacci_sphere(n_pitch)
+    base_quats = base_quaternions(directions)
+
+    # Half spin angle table, shared by every direction
+    half_angles = math.pi * np.arange(n_spin) / n_spin  # half of 2 * pi * i / n_spin
+    cos_half, sin_half = np.cos(half_angles), np.sin(half_angles)
+
+    final_quats = compose_spins(base_quats, cos_half, sin_half)
 
-    for dir_vec in directions:
-        # Compute rotation that maps (0, 0, 1) to dir_vec
-        up = Vector((0, 0, 1))
-        if dir_vec == up:
-            base_quat = Quaternion()
-        else:
-            axis = up.cross(dir_vec)
-            angle = up.angle(dir_vec)
-            base_quat = Quaternion(axis, angle)
-
-        for i in range(n_spin):
-            spin_angle = 2 * math.pi * i / n_spin
-            spin_quat = Quaternion(dir_vec, spin_angle)
-            final_quat = spin_quat @ base_quat
-            obj.rotation_quaternion = final_quat
-            obj.keyframe_insert(data_path="rotation_quaternion", frame=frame)
-            frame += 1
+    frames = np.arange(total_frames) + bpy.context.scene.frame_start
+    insert_keyframes(obj, "rotation_quaternion", frames, final_quats.reshape(total_frames, 4))
 
 main()
@@ -24,10 +24,8 @@ Configuration:
 """
 
 import bpy
-import random
-import math
-from mathutils import Vector, Quaternion, Euler
-import bpy_extras
+import numpy as np
+from mathutils import Vector
 
 # === Configuration ===
 object_names = ["oreo_biscuit_1", "oreo_biscuit_2", "oreo_biscuit_3"]
@@ -53,87 +51,193 @@ for name in object_names:
     else:
         print(f"Warning: Object '{name}' not found.")
 
-# === Helper: Check if object is visible in camera view ===
-def is_object_visible(obj, cam):
+# === Helper: Map camera view coordinates back to world space ===
+def view_to_world_matrix(cam_to_world, frame, is_ortho=False):
     """
-    Determines if an object is visible within the camera's view.
+    Builds the inverse of bpy_extras.object_utils.world_to_camera_view() as a single 4x4 matrix.
     
-    This function projects the object's 3D position into the camera's 2D view space and
-    checks if it falls within the camera's frame boundaries, accounting for the specified
-    margin.
+    Camera view coordinates (normalized frame x/y and depth along the view axis) are
+    mapped back to world space, so that positions can be sampled directly inside the
+    camera frame instead of being rejection-tested. The matrix acts on homogeneous
+    vectors (x * s, y * s, depth, 1), where s is the depth for perspective cameras
+    and 1 for orthographic ones, which lets whole batches be mapped in one product.
     
     Args:
-        obj: Blender object to check for visibility
-        cam: Blender camera object defining the view
+        cam_to_world (Matrix): Normalized camera world matrix
+        frame (list): Camera frame corners from camera.data.view_frame()
+        is_ortho (bool): Whether the camera uses orthographic projection
         
     Returns:
-        bool: True if object is visible in camera view (within bounds_margin), False otherwise
+        numpy.ndarray: A (4, 4) view-to-world matrix
+    """
+    min_x, max_x = frame[2].x, frame[1].x
+    min_y, max_y = frame[1].y, frame[0].y
+
+    if is_ortho:
+        view_to_local = np.array([[max_x - min_x, 0.0, 0.0, min_x],
+                                  [0.0, max_y - min_y, 0.0, min_y],
+                                  [0.0, 0.0, -1.0, 0.0],
+                                  [0.0, 0.0, 0.0, 1.0]])
+    else:
+        focal = -frame[0].z
+        view_to_local = np.array([[(max_x - min_x) / focal, 0.0, min_x / focal, 0.0],
+                                  [0.0, (max_y - min_y) / focal, min_y / focal, 0.0],
+                                  [0.0, 0.0, -1.0, 0.0],
+                                  [0.0, 0.0, 0.0, 1.0]])
+    return np.array(cam_to_world) @ view_to_local
+
+def view_depth_range(cam_to_world):
+    """
+    Computes the depth interval in which sampled positions can satisfy the placement constraints.
+    
+    The interval spans the view-axis depths of the corners of the position_range box,
+    clipped so that nothing closer than min_cam_distance is ever sampled.
+    
+    Args:
+        cam_to_world (Matrix): Normalized camera world matrix
         
-    Note:
-        - Uses bounds_margin to ensure objects aren't too close to the frame edge
-        - Checks x and y coordinates are within [margin, 1-margin] range
-        - Ensures z coordinate is positive (object is in front of camera)
+    Returns:
+        tuple: (near, far) depth bounds along the camera view axis
     """
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    obj_eval = obj.evaluated_get(depsgraph)
-    scene = bpy.context.scene
-    co_3d = obj_eval.location
-    co_2d = bpy_extras.object_utils.world_to_camera_view(scene, cam, co_3d)
-    return (0 + bounds_margin < co_2d.x < 1 - bounds_margin and
-            0 + bounds_margin < co_2d.y < 1 - bounds_margin and
-            co_2d.z > 0)
+    world_to_cam = cam_to_world.inverted()
+    depths = [-(world_to_cam @ Vector((x, y, z))).z
+              for x in (-position_range, position_range)
+              for y in (-position_range, position_range)
+              for z in (-position_range, position_range)]
+    return max(min(depths), min_cam_distance), max(depths)
+
+def random_quaternions(rng, size):
+    """
+    Draws uniformly distributed random rotations with Shoemake's method.
+    
+    Unlike uniform Euler angles, this samples SO(3) uniformly and needs no
+    Euler-to-quaternion conversion.
+    
+    Args:
+        rng (numpy.random.Generator): Random number generator to draw from
+        size (tuple): Leading shape of the returned array
+        
+    Returns:
+        numpy.ndarray: A (*size, 4) array of unit quaternions in (w, x, y, z) order
+    """
+    u1, u2, u3 = np.moveaxis(rng.uniform(size=tuple(size) + (3,)), -1, 0)
+    a, b = np.sqrt(1 - u1), np.sqrt(u1)
+    return np.stack([a * np.sin(2 * np.pi * u2),
+                     a * np.cos(2 * np.pi * u2),
+                     b * np.sin(2 * np.pi * u3),
+                     b * np.cos(2 * np.pi * u3)], axis=-1)
+
+def insert_keyframes(obj, data_path, frames, values):
+    """
+    Bulk-inserts keyframes for every component of an object property.
+    
+    Instead of one keyframe_insert() call per frame, each component gets its own
+    FCurve whose keyframe points are allocated once and filled with foreach_set().
+    
+    Args:
+        obj: Blender object to animate
+        data_path (str): Animated property path (e.g. "location")
+        frames (numpy.ndarray): A (F,) array of frame numbers
+        values (numpy.ndarray): An (F, C) array of property values, one column per component
+    """
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    action = obj.animation_data.action
+
+    count = len(frames)
+    co = np.empty(2 * count, dtype=np.float32)
+    co[0::2] = frames
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.new(data_path, index=index)
+        fcurve.keyframe_points.add(count)
+        co[1::2] = values[:, index]
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.update()
+
+def sample_placements(rng, n_frames, n_objects, view_to_world, near, far, is_ortho=False):
+    """
+    Samples placements for every frame and object in one vectorized pass.
+    
+    For each (frame, object), max_attempts candidate positions are drawn uniformly over
+    the camera frustum (inside bounds_margin and [near, far] depth), mapped to world with view_to_world,
+    and the first one within position_range is kept. Orientation never affects whether a
+    placement is accepted, so only one is drawn per (frame, object).
+    
+    The function is pure NumPy and never touches bpy, so it can run off Blender's main
+    thread; only the keyframe writes afterwards need bpy.
+    
+    Args:
+        rng (numpy.random.Generator): Random number generator to draw from
+        n_frames (int): Number of frames to sample
+        n_objects (int): Number of objects per frame
+        view_to_world (numpy.ndarray): (4, 4) matrix from view_to_world_matrix
+        near (float): Minimum sampled depth along the view axis
+        far (float): Maximum sampled depth along the view axis
+        is_ortho (bool): Whether the camera uses orthographic projection
+        
+    Returns:
+        tuple:
+            - placed: (n_frames, n_objects) mask of pairs with a valid placement
+            - locations: (n_frames, n_objects, 3) world positions
+            - rotations: (n_frames, n_objects, 4) quaternions in (w, x, y, z) order
+    """
+    pool_shape = (n_frames, n_objects, max_attempts)
+    view_pool = rng.uniform(bounds_margin, 1 - bounds_margin, size=pool_shape + (3,))
+
+    # A perspective frustum slice grows with depth squared, so draw depth by inverse CDF
+    # to spread candidates uniformly over the frustum volume rather than over depth
+    depth_u = rng.uniform(size=pool_shape)
+    if is_ortho:
+        view_pool[..., 2] = near + depth_u * (far - near)
+    else:
+        view_pool[..., 2] = np.cbrt(near ** 3 + depth_u * (far ** 3 - near ** 3))
+    rotations = random_quaternions(rng, pool_shape[:2])
+
+    # Map all candidates to world space in one product and keep the first in range
+    scale = 1.0 if is_ortho else view_pool[..., 2:]
+    view_h = np.concatenate([view_pool[..., :2] * scale, view_pool[..., 2:],
+                             np.ones(pool_shape + (1,))], axis=-1)
+    world_pool = (view_h @ view_to_world.T)[..., :3]
+    valid = np.all(np.abs(world_pool) <= position_range, axis=-1)
+    chosen = valid.argmax(axis=-1)[..., None, None]
+    locations = np.take_along_axis(world_pool, chosen, axis=2)[:, :, 0]
+    return valid.any(axis=-1), locations, rotations
 
 def main():
     """
     Main animation logic:
 
-    For each frame in the animation range:
-    1. For each object:
-    - Generate random positions and orientations until finding one where:
-        - Object is within position_range constraint
-        - Object is at least min_cam_distance from camera
-        - Object is visible in the camera view (checked with is_object_visible)
-    - When valid placement is found, insert keyframes for location and rotation
+    1. Build the camera view-to-world matrix and the usable depth range once
+    2. Sample placements for every frame and object at once (sample_placements):
+    - Positions are sampled in camera view space and mapped back with view_to_world_matrix,
+      so every candidate is visible and at least min_cam_distance from the camera by construction
+    - The first candidate within the position_range constraint is kept, together with one
+      uniformly random orientation (random_quaternions)
     - If no valid placement is found after max_attempts, print warning
+    3. Write the kept placements of each object as keyframes in one bulk pass
 
     The result is an animation sequence where all objects are randomly positioned
     but guaranteed to be visible in each frame.
     """
-    cam_pos = camera.matrix_world.translation
-
-    for frame in range(frame_start, frame_end + 1):
-        for obj in objects:
-            placed = False
-            attempts = 0
-
-            while not placed and attempts < max_attempts:
-                # Generate random position and orientation
-                pos = Vector((random.uniform(-position_range, position_range),
-                            random.uniform(-position_range, position_range),
-                            random.uniform(-position_range, position_range)))
-
-                rot = Euler((random.uniform(0, 2 * math.pi),
-                            random.uniform(0, 2 * math.pi),
-                            random.uniform(0, 2 * math.pi)), 'XYZ').to_quaternion()
-
-                # Check distance to camera
-                if (pos - cam_pos).length < min_cam_distance:
-                    attempts += 1
-                    continue
-
-                # Apply transform
-                obj.location = pos
-                obj.rotation_quaternion = rot
-
-                # Check visibility
-                if is_object_visible(obj, camera):
-                    obj.keyframe_insert(data_path="location", frame=frame)
-                    obj.keyframe_insert(data_path="rotation_quaternion", frame=frame)
-                    placed = True
-
-                attempts += 1
-
-            if not placed:
-                print(f"Frame {frame} | {obj.name}: No valid placement found in {max_attempts} attempts.")
+    scene = bpy.context.scene
+    cam_to_world = camera.matrix_world.normalized()
+    is_ortho = camera.data.type == 'ORTHO'
+    view_to_world = view_to_world_matrix(cam_to_world, camera.data.view_frame(scene=scene), is_ortho)
+    near, far = view_depth_range(cam_to_world)
+
+    frame_numbers = np.arange(frame_start, frame_end + 1)
+    placed, locations, rotations = sample_placements(np.random.default_rng(), len(frame_numbers),
+                                                     len(objects), view_to_world, near, far, is_ortho)
+
+    for f_idx, k in np.argwhere(~placed):
+        print(f"Frame {frame_numbers[f_idx]} | {objects[k].name}: No valid placement found in {max_attempts} attempts.")
+
+    for k, obj in enumerate(objects):
+        mask = placed[:, k]
+        if mask.any():
+            insert_keyframes(obj, "location", frame_numbers[mask], locations[mask, k])
+            insert_keyframes(obj, "rotation_quaternion", frame_numbers[mask], rotations[mask, k])
 
 main()
\ No newline at end of file
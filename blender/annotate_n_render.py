@@ -22,24 +22,39 @@ Configuration:
     ORBIT_DISTANCE: Distance for orbiting lights (default: 1.0)
     HIDE_SUN: Whether to hide the default sun light (default: False)
     FRAME_OFFSET: Offset for frame numbering (default: 0)
+    LABEL_TYPE: Points the bounding boxes are fitted to (options: 'label_vertice' for all
+        mesh vertices, 'label_cuboid' for the 8 corners of the object's bounding box)
 
 Functions:
+    - parse_script_args(): Parses frame range and seed overrides from the command line
     - compose_setname(): Generates dataset name based on parameters
     - ensure_directories(): Creates output directories
     - clean_lights(): Removes generated lights
     - create_lights(): Creates random lights
     - animate_lights(): Animates lights with random properties
-    - generate_*_pattern(): Creates various background patterns
+    - generate_*_pattern(): Draws random values of various background patterns
+    - setup_background_nodes(): Builds (once) and links the background node graph
     - animate_background(): Sets up and animates backgrounds
-    - annotate_frame(): Creates annotations for a single frame
+    - find_targets(): Collects objects to annotate with their class index
+    - annotate_frame(): Computes annotations for a single frame
+    - write_annotations(): Saves the packed annotations and the per-frame label files
+    - camera_projection(): Computes the camera projection terms of a frame
+    - world_to_camera_view_batch(): Projects many world coordinates into camera view
+    - mesh_vertices(): Reads (once) the vertex coordinates of a mesh
     - create_data(): Converts 3D object coordinates to 2D bounding boxes
     - render_setup(): Sets up rendering environment
+    - setup_renderer(): Enables persistent render data and, on request, the GPU
+    - enable_gpu(): Selects a Cycles GPU backend and enables its devices
     - render_frame(): Renders a single frame
     - process_frames(): Main function to process all frames
+    - link_annotations(): Hardlinks label files into datasets sharing the same poses
+    - process_patterns(): Processes all frames for several background patterns at once
 
 Output Format:
     - Images: JPG files in render_result/{SETNAME}/
-    - Annotations: YOLO format text files in annotation/{SETNAME}/label_vertice/
+    - Annotations: YOLO format text files in annotation/{SETNAME}/{LABEL_TYPE}/, plus all
+      boxes of a run as one (N, 6) array annotation/{SETNAME}/boxes_<first>_<last>.npy
+      of rows (frame, class, cx, cy, w, h)
       Format: <class> <cx> <cy> <w> <h>
       Where:
         - class: Object class index (0 for Oreo cookie)
@@ -49,19 +64,40 @@ Output Format:
 Example:
     To generate a dataset with different background patterns:
     ```
-    for bgpatt_opt in ['SOLID', 'NOISE', 'VORONOI']:
-        BACKGROUND_PATTERN = bgpatt_opt
-        SETNAME = compose_setname()
-        process_frames()
+    process_patterns(['SOLID', 'NOISE', 'VORONOI'])
     ```
+    Annotations and lights are shared between the datasets; only the background differs.
 '''
 
+import argparse
 import bpy
-import bpy_extras.object_utils
+import itertools
 import mathutils
+import numpy as np
 import os
-import random
 import math
+import re
+import sys
+
+def parse_script_args():
+    """
+    Parses the script options passed after '--' on the Blender command line.
+    
+    This lets several headless Blender processes each handle a disjoint frame range, e.g.
+    blender -b scene.blend -P annotate_n_render.py -- --start-frame 1 --end-frame 500 --seed 0
+    
+    Returns:
+        argparse.Namespace: Parsed options; unset options are None
+    """
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Render and annotate synthetic cookie data")
+    parser.add_argument("--start-frame", type=int, default=None, help="First frame to process (default: scene start)")
+    parser.add_argument("--end-frame", type=int, default=None, help="Last frame to process (default: scene end)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the random lighting and backgrounds")
+    parser.add_argument("--gpu", action="store_true", help="Render with Cycles on all available GPU devices")
+    parser.add_argument("--check-gpu", action="store_true",
+                        help="Only check that --gpu can find a GPU device, then exit (non-zero if none)")
+    return parser.parse_args(argv)
 
 def compose_setname():
     """
@@ -93,7 +129,7 @@ def ensure_directories():
     Creates necessary output directories for rendered images and annotations.
     
     If ENABLE_RENDER is True, creates the render_result/{SETNAME} directory.
-    If ENABLE_ANNOTATION is True, creates the annotation/{SETNAME}/label_vertice directory.
+    If ENABLE_ANNOTATION is True, creates the annotation/{SETNAME}/{LABEL_TYPE} directory.
     
     All directories are created with exist_ok=True to prevent errors if they already exist.
     """
@@ -101,11 +137,11 @@ def ensure_directories():
         os.makedirs(f"render_result/{SETNAME}", exist_ok=True)
 
     if ENABLE_ANNOTATION:
-        os.makedirs(f"annotation/{SETNAME}/label_vertice", exist_ok=True)
+        os.makedirs(f"annotation/{SETNAME}/{LABEL_TYPE}", exist_ok=True)
 
 def clean_lights(num_lights):
     """
-    Removes all previously created lights from the scene.
+    Removes all previously created lights and their light data from the scene.
     
     Args:
         num_lights (int): Number of lights to remove
@@ -114,7 +150,10 @@ def clean_lights(num_lights):
         Lights are assumed to be named 'hikari_0', 'hikari_1', etc.
     """
     for i in range(num_lights):
-        bpy.data.objects.remove(bpy.data.objects[f'hikari_{i}'])
+        light_object = bpy.data.objects[f'hikari_{i}']
+        light_data = light_object.data
+        bpy.data.objects.remove(light_object)
+        bpy.data.lights.remove(light_data)
 
 def create_lights(num_lights):
     """
@@ -127,25 +166,110 @@ def create_lights(num_lights):
         list: List of light objects created
         
     Note:
-        Created lights are named 'hikari_0', 'hikari_1', etc.
+        Created lights are named 'hikari_0', 'hikari_1', etc. Lights of that name left
+        in the file (e.g. by an interrupted run) are reused instead of duplicated.
+        All objects are created first and then linked to the collection in one pass.
     """
     lights = []
     for i in range(num_lights):
-        light_data = bpy.data.lights.new(name=f"hikari_{i}", type='POINT')
-        light_object = bpy.data.objects.new(name=f"hikari_{i}", object_data=light_data)
-        bpy.context.collection.objects.link(light_object)
+        light_object = bpy.data.objects.get(f"hikari_{i}")
+        if light_object is None:
+            light_data = bpy.data.lights.new(name=f"hikari_{i}", type='POINT')
+            light_object = bpy.data.objects.new(name=f"hikari_{i}", object_data=light_data)
         lights.append(light_object)
+
+    collection = bpy.context.collection
+    for light_object in lights:
+        if collection.objects.get(light_object.name) is None:
+            collection.objects.link(light_object)
     return lights
 
+def insert_keyframes(id_data, data_path, frames, values):
+    """
+    Bulk-inserts keyframes for every component of an animatable property.
+    
+    Instead of one keyframe_insert() call per frame, each component gets its own
+    FCurve whose keyframe points are allocated once and filled with foreach_set().
+    Existing FCurves for the property are reused and their keyframes replaced.
+    Keyframes use 'CONSTANT' interpolation.
+    
+    Args:
+        id_data: Blender ID owning the property (object, light data, node tree, ...)
+        data_path (str): Property path relative to id_data (e.g. "location")
+        frames (numpy.ndarray): A (F,) array of frame numbers
+        values (numpy.ndarray): An (F, C) array of property values, one column per component
+    """
+    if id_data.animation_data is None:
+        id_data.animation_data_create()
+    if id_data.animation_data.action is None:
+        id_data.animation_data.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+    action = id_data.animation_data.action
+
+    count = len(frames)
+    co = np.empty(2 * count, dtype=np.float32)
+    co[0::2] = frames
+    # Every frame holds independent random values, so 'CONSTANT' (enum value 0)
+    # interpolation is enough and spares Bezier handle computation
+    interpolation = np.zeros(count, dtype=np.int32)
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is None:
+            fcurve = action.fcurves.new(data_path, index=index)
+        else:
+            fcurve.keyframe_points.clear()
+        fcurve.keyframe_points.add(count)
+        co[1::2] = values[:, index]
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.keyframe_points.foreach_set("interpolation", interpolation)
+        fcurve.update()
+
+def animated_locations(obj, frames):
+    """
+    Reads an object's (possibly animated) location at every given frame.
+    
+    Location FCurves are read directly, which avoids a scene.frame_set() and the
+    full depsgraph evaluation it triggers for each frame. Frames that carry a keyframe
+    take its value from one foreach_get() of all keyframes; only the frames in between
+    are evaluated one by one.
+    
+    Args:
+        obj: Blender object to sample
+        frames (numpy.ndarray): A (F,) array of frame numbers
+        
+    Returns:
+        numpy.ndarray: An (F, 3) array of locations; unanimated axes keep obj.location
+    """
+    locations = np.tile(np.array(obj.location), (len(frames), 1))
+    action = obj.animation_data.action if obj.animation_data else None
+    if action is not None:
+        for index in range(3):
+            fcurve = action.fcurves.find("location", index=index)
+            if fcurve is None:
+                continue
+
+            keyframes = np.empty(2 * len(fcurve.keyframe_points), dtype=np.float32)
+            fcurve.keyframe_points.foreach_get("co", keyframes)
+            key_frames, key_values = keyframes[0::2], keyframes[1::2]
+
+            # A curve passes through its keyframes, unless modifiers reshape it
+            on_key = np.zeros(len(frames), dtype=bool)
+            if len(key_frames) and not fcurve.modifiers:
+                slot = np.minimum(np.searchsorted(key_frames, frames), len(key_frames) - 1)
+                on_key = key_frames[slot] == frames
+                locations[on_key, index] = key_values[slot[on_key]]
+            locations[~on_key, index] = [fcurve.evaluate(frame) for frame in frames[~on_key]]
+    return locations
+
 def animate_lights(scene, lights, objects, start_frame, end_frame, orbit_distance):
     """
     Animates light objects with random properties throughout the animation frames.
     
     For each frame, each light is:
-    - Positioned randomly around a reference object
+    - Positioned randomly around a reference object (at its location in that frame)
     - Given random color values
     - Given random energy (intensity) values
-    - Keyframed for location, color and energy
+    The values of all frames are then keyframed for location, color and energy in
+    one bulk pass per light (insert_keyframes).
     
     Args:
         scene: Blender scene object
@@ -155,313 +279,440 @@ def animate_lights(scene, lights, objects, start_frame, end_frame, orbit_distanc
         end_frame (int): Last frame of animation
         orbit_distance (float): Radius for light orbiting around reference objects
     """
-    for light in lights:
-        for frame in range(start_frame, end_frame + 1):
-            scene.frame_set(frame)
-
-            ref_object = random.choice(objects)
-            ref_location = ref_object.location
-
-            angle_x = random.uniform(0, 2 * math.pi)
-            angle_y = random.uniform(0, 2 * math.pi)
+    frames = np.arange(start_frame, end_frame + 1)
+    ref_locations = np.stack([animated_locations(obj, frames) for obj in objects])  # (O, F, 3)
+
+    # Draw the random values of every light and frame at once
+    shape = (len(lights), len(frames))
+    ref_choice = RNG.integers(len(objects), size=shape)
+    angle_x, angle_y = RNG.uniform(0, 2 * math.pi, size=(2,) + shape)
+    offsets = orbit_distance * np.stack([np.sin(angle_x) * np.cos(angle_y),
+                                         np.sin(angle_x) * np.sin(angle_y),
+                                         np.cos(angle_x)], axis=-1)
+    locations = ref_locations[ref_choice, np.arange(len(frames))] + offsets
+    colors = RNG.uniform(0.0, 1.0, size=shape + (3,))
+    energies = RNG.uniform(10.0, 50.0, size=shape + (1,))
+
+    for k, light in enumerate(lights):
+        insert_keyframes(light, "location", frames, locations[k])
+        insert_keyframes(light.data, "color", frames, colors[k])
+        insert_keyframes(light.data, "energy", frames, energies[k])
+
+def random_colors(count):
+    """
+    Draws random opaque RGBA colors.
+    
+    Args:
+        count (int): Number of colors (one per frame)
+        
+    Returns:
+        numpy.ndarray: A (count, 4) array of colors with alpha 1
+    """
+    colors = np.ones((count, 4))
+    colors[:, :3] = RNG.uniform(0.0, 1.0, size=(count, 3))
+    return colors
 
-            x_offset = orbit_distance * math.sin(angle_x) * math.cos(angle_y)
-            y_offset = orbit_distance * math.sin(angle_x) * math.sin(angle_y)
-            z_offset = orbit_distance * math.cos(angle_x)
+def random_mapping(mapping_node, count):
+    """
+    Draws random texture transformations (rotation, location, scale) for a mapping node.
+    
+    Args:
+        mapping_node: Blender mapping node for transformation
+        count (int): Number of frames
+        
+    Returns:
+        list: (socket, values) pairs, each values array holding one row per frame
+    """
+    rotation = RNG.uniform(0, math.pi, size=(count, 3))
 
-            light.location = (
-                ref_location.x + x_offset,
-                ref_location.y + y_offset,
-                ref_location.z + z_offset
-            )
+    location = np.zeros((count, 3))
+    location[:, :2] = RNG.uniform(-5.0, 5.0, size=(count, 2))
 
-            light.data.color = (
-                random.uniform(0.0, 1.0),
-                random.uniform(0.0, 1.0),
-                random.uniform(0.0, 1.0)
-            )
+    scale = np.ones((count, 3))
+    scale[:, :2] = RNG.uniform(0.5, 2.0, size=(count, 2))
 
-            light.data.energy = random.uniform(10.0, 50.0)
-            light.keyframe_insert(data_path="location", frame=frame)
-            light.data.keyframe_insert(data_path="color", frame=frame)
-            light.data.keyframe_insert(data_path="energy", frame=frame)
+    return [
+        (mapping_node.inputs['Rotation'], rotation),
+        (mapping_node.inputs['Location'], location),
+        (mapping_node.inputs['Scale'], scale),
+    ]
 
-def generate_grid_pattern(background_node, mapping_node, checker_node, frame):
+def generate_grid_pattern(mapping_node, checker_node, count):
     """
-    Generates a checker grid pattern background with random properties for the given frame.
+    Generates checker grid pattern backgrounds with random properties for a run of frames.
     
-    Randomizes and keyframes:
+    Randomizes:
     - Checker scale
     - Checker colors (two random colors)
     - Transformation (rotation, location, scale)
     
     Args:
-        background_node: Blender background shader node
         mapping_node: Blender mapping node for transformation
         checker_node: Blender checker texture node
-        frame (int): Current frame number to set keyframes
-    """
-    # Randomize checker scale
-    checker_node.inputs['Scale'].default_value = random.uniform(10.0, 50.0)
-
-    # Randomize checker colors
-    checker_node.inputs['Color1'].default_value = (
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        1.0
-    )
-    checker_node.inputs['Color2'].default_value = (
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        1.0
-    )
-
-    # Randomize transformation
-    mapping_node.inputs['Rotation'].default_value = (
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi)
-    )
-    mapping_node.inputs['Location'].default_value = (
-        random.uniform(-5.0, 5.0),
-        random.uniform(-5.0, 5.0),
-        0.0
-    )
-    mapping_node.inputs['Scale'].default_value = (
-        random.uniform(0.5, 2.0),
-        random.uniform(0.5, 2.0),
-        1.0
-    )
-
-    # Keyframe parameters
-    checker_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-    checker_node.inputs['Color1'].keyframe_insert(data_path="default_value", frame=frame)
-    checker_node.inputs['Color2'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Rotation'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Location'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-
-    background_node.inputs[0].keyframe_insert(data_path="default_value", frame=frame)
-
-def generate_noise_pattern(background_node, mapping_node, noise_node, frame):
-    """
-    Generates a noise pattern background with random properties for the given frame.
-    
-    Randomizes and keyframes:
+        count (int): Number of frames
+        
+    Returns:
+        list: (socket, values) pairs, each values array holding one row per frame
+    """
+    return [
+        (checker_node.inputs['Scale'], RNG.uniform(10.0, 50.0, size=(count, 1))),
+        (checker_node.inputs['Color1'], random_colors(count)),
+        (checker_node.inputs['Color2'], random_colors(count)),
+    ] + random_mapping(mapping_node, count)
+
+def generate_noise_pattern(mapping_node, noise_node, count):
+    """
+    Generates noise pattern backgrounds with random properties for a run of frames.
+    
+    Randomizes:
     - Noise scale, detail, roughness, distortion, and lacunarity
     - Transformation (rotation, location, scale)
     
     Args:
-        background_node: Blender background shader node
         mapping_node: Blender mapping node for transformation
         noise_node: Blender noise texture node
-        frame (int): Current frame number to set keyframes
-    """
-    # Randomize noise
-    noise_node.inputs['Scale'].default_value = random.uniform(1.0, 10.0)
-    noise_node.inputs['Detail'].default_value = random.uniform(0.0, 16.0)
-    noise_node.inputs['Roughness'].default_value = random.uniform(0.0, 0.1)
-    noise_node.inputs['Distortion'].default_value = random.uniform(0.0, 0.5)
-    noise_node.inputs['Lacunarity'].default_value = random.uniform(8.0, 32.0)
-
-    mapping_node.inputs['Rotation'].default_value = (
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi)
-    )
-    mapping_node.inputs['Location'].default_value = (
-        random.uniform(-5.0, 5.0),
-        random.uniform(-5.0, 5.0),
-        0.0
-    )
-    mapping_node.inputs['Scale'].default_value = (
-        random.uniform(0.5, 2.0),
-        random.uniform(0.5, 2.0),
-        1.0
-    )
-
-    # Keyframe parameters
-    noise_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-    noise_node.inputs['Detail'].keyframe_insert(data_path="default_value", frame=frame)
-    noise_node.inputs['Roughness'].keyframe_insert(data_path="default_value", frame=frame)
-    noise_node.inputs['Distortion'].keyframe_insert(data_path="default_value", frame=frame)
-    noise_node.inputs['Lacunarity'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Rotation'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Location'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-
-    background_node.inputs[0].keyframe_insert(data_path="default_value", frame=frame)
-
-def generate_voronoi_pattern(background_node, mapping_node, voronoi_node, frame):
-    """
-    Generates a Voronoi pattern background with random properties for the given frame.
-    
-    Randomizes and keyframes:
+        count (int): Number of frames
+        
+    Returns:
+        list: (socket, values) pairs, each values array holding one row per frame
+    """
+    return [
+        (noise_node.inputs['Scale'], RNG.uniform(1.0, 10.0, size=(count, 1))),
+        (noise_node.inputs['Detail'], RNG.uniform(0.0, 16.0, size=(count, 1))),
+        (noise_node.inputs['Roughness'], RNG.uniform(0.0, 0.1, size=(count, 1))),
+        (noise_node.inputs['Distortion'], RNG.uniform(0.0, 0.5, size=(count, 1))),
+        (noise_node.inputs['Lacunarity'], RNG.uniform(8.0, 32.0, size=(count, 1))),
+    ] + random_mapping(mapping_node, count)
+
+def generate_voronoi_pattern(mapping_node, voronoi_node, count):
+    """
+    Generates Voronoi pattern backgrounds with random properties for a run of frames.
+    
+    Randomizes:
     - Voronoi scale, detail, roughness, randomness, and lacunarity
     - Transformation (rotation, location, scale)
     
     Args:
-        background_node: Blender background shader node
         mapping_node: Blender mapping node for transformation
         voronoi_node: Blender Voronoi texture node
-        frame (int): Current frame number to set keyframes
-    """
-    # Randomize noise
-    voronoi_node.inputs['Scale'].default_value = random.uniform(1.0, 10.0)
-    voronoi_node.inputs['Detail'].default_value = random.uniform(0.0, 16.0)
-    voronoi_node.inputs['Roughness'].default_value = random.uniform(0.0, 0.1)
-    voronoi_node.inputs['Randomness'].default_value = random.uniform(0.0, 1.0)
-    voronoi_node.inputs['Lacunarity'].default_value = random.uniform(8.0, 32.0)
-
-    mapping_node.inputs['Rotation'].default_value = (
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi),
-        random.uniform(0, math.pi)
-    )
-    mapping_node.inputs['Location'].default_value = (
-        random.uniform(-5.0, 5.0),
-        random.uniform(-5.0, 5.0),
-        0.0
-    )
-    mapping_node.inputs['Scale'].default_value = (
-        random.uniform(0.5, 2.0),
-        random.uniform(0.5, 2.0),
-        1.0
-    )
-
-    # Keyframe parameters
-    voronoi_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-    voronoi_node.inputs['Detail'].keyframe_insert(data_path="default_value", frame=frame)
-    voronoi_node.inputs['Roughness'].keyframe_insert(data_path="default_value", frame=frame)
-    voronoi_node.inputs['Randomness'].keyframe_insert(data_path="default_value", frame=frame)
-    voronoi_node.inputs['Lacunarity'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Rotation'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Location'].keyframe_insert(data_path="default_value", frame=frame)
-    mapping_node.inputs['Scale'].keyframe_insert(data_path="default_value", frame=frame)
-
-    background_node.inputs[0].keyframe_insert(data_path="default_value", frame=frame)
-
-def generate_solid_pattern(background_node, frame):
-    """
-    Generates a solid color background with random RGB values for the given frame.
+        count (int): Number of frames
+        
+    Returns:
+        list: (socket, values) pairs, each values array holding one row per frame
+    """
+    return [
+        (voronoi_node.inputs['Scale'], RNG.uniform(1.0, 10.0, size=(count, 1))),
+        (voronoi_node.inputs['Detail'], RNG.uniform(0.0, 16.0, size=(count, 1))),
+        (voronoi_node.inputs['Roughness'], RNG.uniform(0.0, 0.1, size=(count, 1))),
+        (voronoi_node.inputs['Randomness'], RNG.uniform(0.0, 1.0, size=(count, 1))),
+        (voronoi_node.inputs['Lacunarity'], RNG.uniform(8.0, 32.0, size=(count, 1))),
+    ] + random_mapping(mapping_node, count)
+
+def generate_solid_pattern(background_node, count):
+    """
+    Generates solid color backgrounds with random RGB values for a run of frames.
     
     Args:
         background_node: Blender background shader node
-        frame (int): Current frame number to set keyframes
+        count (int): Number of frames
+        
+    Returns:
+        list: (socket, values) pairs, each values array holding one row per frame
     """
-    # Set random solid color
-    background_node.inputs[0].default_value = (
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        random.uniform(0.0, 1.0),
-        1.0
-    )
+    return [(background_node.inputs[0], random_colors(count))]
 
-    # Keyframe color
-    background_node.inputs[0].keyframe_insert(data_path="default_value", frame=frame)
+# Shader node type of each textured background pattern
+PATTERN_NODE_TYPES = {
+    'GRID': 'ShaderNodeTexChecker',
+    'NOISE': 'ShaderNodeTexNoise',
+    'VORONOI': 'ShaderNodeTexVoronoi',
+}
 
-# Animate random background
-def animate_background(scene, start_frame, end_frame):
+# Background nodes built by setup_background_nodes(), kept across process_frames() calls
+BACKGROUND_NODES = {}
+
+def setup_background_nodes(world):
     """
-    Sets up and animates the background for all frames based on BACKGROUND_PATTERN.
+    Builds the background node graph on first use and links it for BACKGROUND_PATTERN.
     
-    Creates necessary nodes for the selected pattern type and applies the appropriate
-    pattern generation function to each frame.
+    The mapping and texture coordinate nodes, and each pattern node, are created only
+    once and cached in BACKGROUND_NODES. Switching patterns on later calls just relinks
+    the cached pattern node to the background, instead of removing and recreating nodes.
     
     Args:
-        scene: Blender scene object
-        start_frame (int): First frame of animation
-        end_frame (int): Last frame of animation
+        world: Blender world whose node tree holds the background
+        
+    Returns:
+        tuple: (background_node, mapping_node, pattern_node); the last two are None
+        for the 'SOLID' pattern
     """
-    world = bpy.data.worlds["World"]
     nodes = world.node_tree.nodes
     links = world.node_tree.links
+    background_node = nodes.get("Background")
 
-    for node in nodes:
-        if node.type in ['TEX_CHECKER', 'TEX_NOISE', 'TEX_VORONOI', 'MAPPING', 'TEX_COORD']:
+    if not BACKGROUND_NODES:
+        # Remove pattern nodes left over from earlier runs of the script
+        for node in [node for node in nodes if node.type in ['TEX_CHECKER', 'TEX_NOISE', 'TEX_VORONOI', 'MAPPING', 'TEX_COORD']]:
             nodes.remove(node)
 
-    background_node = nodes.get("Background")
-
-    if BACKGROUND_PATTERN != 'SOLID':
         mapping_node = nodes.new(type='ShaderNodeMapping')
         tex_coord_node = nodes.new(type='ShaderNodeTexCoord')
+        links.new(tex_coord_node.outputs['Generated'], mapping_node.inputs['Vector'])
+        BACKGROUND_NODES['MAPPING'] = mapping_node
 
-        if BACKGROUND_PATTERN == 'GRID':
-            pattern_node = nodes.new(type='ShaderNodeTexChecker')
-        elif BACKGROUND_PATTERN == 'NOISE':
-            pattern_node = nodes.new(type='ShaderNodeTexNoise')
-        elif BACKGROUND_PATTERN == 'VORONOI':
-            pattern_node = nodes.new(type='ShaderNodeTexVoronoi')
+    mapping_node = BACKGROUND_NODES['MAPPING']
 
-        links.new(tex_coord_node.outputs['Generated'], mapping_node.inputs['Vector'])
+    if BACKGROUND_PATTERN == 'SOLID':
+        for link in list(background_node.inputs[0].links):
+            links.remove(link)
+        return background_node, None, None
+
+    pattern_node = BACKGROUND_NODES.get(BACKGROUND_PATTERN)
+    if pattern_node is None:
+        pattern_node = nodes.new(type=PATTERN_NODE_TYPES[BACKGROUND_PATTERN])
         links.new(mapping_node.outputs['Vector'], pattern_node.inputs['Vector'])
-        links.new(pattern_node.outputs['Color'], background_node.inputs[0])
+        BACKGROUND_NODES[BACKGROUND_PATTERN] = pattern_node
 
-    for frame in range(start_frame, end_frame + 1):
-        if BACKGROUND_PATTERN == 'GRID':
-            generate_grid_pattern(background_node, mapping_node, pattern_node, frame)
-        elif BACKGROUND_PATTERN == 'NOISE':
-            generate_noise_pattern(background_node, mapping_node, pattern_node, frame)
-        elif BACKGROUND_PATTERN == 'SOLID':
-            generate_solid_pattern(background_node, frame)
-        elif BACKGROUND_PATTERN == 'VORONOI':
-            generate_voronoi_pattern(background_node, mapping_node, pattern_node, frame)
+    links.new(pattern_node.outputs['Color'], background_node.inputs[0])
+    return background_node, mapping_node, pattern_node
+
+# Animate random background
+def animate_background(scene, start_frame, end_frame):
+    """
+    Sets up and animates the background for all frames based on BACKGROUND_PATTERN.
+    
+    Links the node graph for the selected pattern type (setup_background_nodes), draws
+    the random pattern values of all frames with the matching generate_*_pattern()
+    function and keyframes every animated node input in one bulk pass (insert_keyframes).
+    
+    Args:
+        scene: Blender scene object
+        start_frame (int): First frame of animation
+        end_frame (int): Last frame of animation
+    """
+    world = bpy.data.worlds["World"]
+    background_node, mapping_node, pattern_node = setup_background_nodes(world)
+
+    frames = np.arange(start_frame, end_frame + 1)
+
+    if BACKGROUND_PATTERN == 'GRID':
+        channels = generate_grid_pattern(mapping_node, pattern_node, len(frames))
+    elif BACKGROUND_PATTERN == 'NOISE':
+        channels = generate_noise_pattern(mapping_node, pattern_node, len(frames))
+    elif BACKGROUND_PATTERN == 'SOLID':
+        channels = generate_solid_pattern(background_node, len(frames))
+    elif BACKGROUND_PATTERN == 'VORONOI':
+        channels = generate_voronoi_pattern(mapping_node, pattern_node, len(frames))
+
+    for socket, values in channels:
+        insert_keyframes(world.node_tree, socket.path_from_id("default_value"), frames, values)
+
+def find_targets():
+    """
+    Collects the objects to annotate together with their class index.
+    
+    An object is a target when its name starts with a key of the classification
+    dictionary. Names are matched with the precompiled CLASS_PATTERN, whose
+    alternatives are ordered longest first, so the most specific key decides the class.
+    
+    Note:
+        The result is computed once into TARGETS when the script starts; the
+        processing functions reuse it instead of rescanning bpy.data.objects.
+    
+    Returns:
+        list: List of (object, class_index) tuples
+    """
+    targets = []
+    for obj in bpy.data.objects:
+        match = CLASS_PATTERN.match(obj.name)
+        if match:
+            targets.append((obj, classification[match.group()]))
+    return targets
 
-def annotate_frame(scene, frame):
+def annotate_frame(scene, frame, targets, rows):
     """
-    Creates annotation files for objects in the given frame.
+    Computes the annotations of the target objects in the given frame.
     
-    Processes each object that starts with a name defined in the classification dictionary
-    and creates YOLO format bounding box annotations.
+    Creates YOLO format bounding box annotations for each target object and appends
+    them to rows; the files are written afterwards by write_annotations().
     
     Args:
         scene: Blender scene object
         frame (int): Frame number to annotate
+        targets (list): (object, class_index) tuples from find_targets() (TARGETS)
+        rows (list): Annotation rows of all frames, appended to
     """
     scene.frame_set(frame)
 
-    label_filepath = {
-        'vertice_bbox': f"annotation/{SETNAME}/label_vertice/{frame+FRAME_OFFSET}.txt",
-    }
-
     camera = bpy.data.objects['Camera']
+    projection = camera_projection(scene, camera)
 
-    for obj in bpy.data.objects:
-        if obj.name.startswith(tuple(classification.keys())):
-            create_data(camera, scene, obj, label_filepath)
+    for obj, class_label in targets:
+        create_data(projection, obj, class_label, frame + FRAME_OFFSET, rows)
 
-def create_data(camera, scene, obj, label_save):
+def write_annotations(rows, start_frame, end_frame):
     """
-    Converts 3D object data to 2D bounding box annotations in YOLO format.
+    Writes the annotation rows of a frame range in one pass.
     
-    Calculates the bounding box by projecting the object's vertices into camera space.
-    Writes annotation in format: <class> <cx> <cy> <w> <h>
+    All rows are saved as one packed (N, 6) array of (label_index, class, cx, cy, w, h),
+    then the per-frame YOLO label files are emitted, one file per group of rows of
+    the same frame.
+    
+    Args:
+        rows (list): Rows appended by annotate_frame(), in frame order
+        start_frame (int): First annotated frame
+        end_frame (int): Last annotated frame
+        
+    Note:
+        The packed array is named after its label index range, so processes working on
+        disjoint frame ranges of one dataset never overwrite each other's arrays.
+        Frames without visible objects get no label file; files an earlier run left in
+        the frame range are removed first, so they cannot survive as false labels.
+    """
+    np.save(f"annotation/{SETNAME}/boxes_{start_frame + FRAME_OFFSET}_{end_frame + FRAME_OFFSET}.npy",
+            np.array(rows, dtype=np.float64).reshape(-1, 6))
+
+    label_dir = f"annotation/{SETNAME}/{LABEL_TYPE}"
+    for frame in range(start_frame, end_frame + 1):
+        label_path = f"{label_dir}/{frame + FRAME_OFFSET}.txt"
+        if os.path.exists(label_path):
+            os.remove(label_path)
+
+    for label_index, frame_rows in itertools.groupby(rows, key=lambda row: row[0]):
+        with open(f"{label_dir}/{label_index}.txt", 'w') as f:
+            f.write("".join(f"{class_label} {x_center_v} {y_center_v} {width_v} {height_v} \n"
+                            for _, class_label, x_center_v, y_center_v, width_v, height_v in frame_rows))
+
+def camera_projection(scene, camera):
+    """
+    Computes the per-frame terms of bpy_extras.object_utils.world_to_camera_view().
+    
+    These only depend on the camera, so they are computed once per frame and shared
+    by every object and vertex projected in that frame.
     
     Args:
-        camera: Blender camera object
         scene: Blender scene object
+        camera: Blender camera object
+        
+    Returns:
+        tuple: (world_to_cam, frame_min, frame_size, focal), where world_to_cam is the
+        (4, 4) world to camera matrix, frame_min and frame_size are the (2,) corner and
+        extent of the camera frame, and focal is the frame depth (None for orthographic
+        cameras)
+        
+    Note:
+        The terms are float64 copies of the float32 mathutils values, so projections
+        with them match world_to_camera_view() within float32 precision.
+    """
+    world_to_cam = np.array(camera.matrix_world.normalized().inverted())
+
+    frame = camera.data.view_frame(scene=scene)
+    frame_min = np.array([frame[2].x, frame[1].y])
+    frame_size = np.array([frame[1].x, frame[0].y]) - frame_min
+
+    focal = -frame[0].z if camera.data.type != 'ORTHO' else None
+    return world_to_cam, frame_min, frame_size, focal
+
+def world_to_camera_view_batch(projection, coords):
+    """
+    Vectorized bpy_extras.object_utils.world_to_camera_view() for many points.
+    
+    Args:
+        projection (tuple): Camera terms of the frame from camera_projection()
+        coords (numpy.ndarray): An (N, 3) array of world space coordinates
+        
+    Returns:
+        numpy.ndarray: An (N, 3) array of (x, y, depth); x and y are normalized to the
+        camera frame and depth is the distance along the view axis
+        
+    Note:
+        Computes in float64 where mathutils uses float32, so the results match
+        world_to_camera_view() within float32 precision, not bit for bit.
+    """
+    world_to_cam, frame_min, frame_size, focal = projection
+    co_local = coords @ world_to_cam[:3, :3].T + world_to_cam[:3, 3]
+    xy, z = co_local[:, :2], -co_local[:, 2]
+
+    if focal is not None:
+        # The frame scales with depth; undo that on the point instead of the frame
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xy = xy * (focal / z)[:, None]
+
+    result = np.empty((len(coords), 3))
+    result[:, :2] = (xy - frame_min) / frame_size
+    result[:, 2] = z
+    if focal is not None:
+        result[z == 0.0] = (0.5, 0.5, 0.0)
+    return result
+
+# Local vertex coordinates of each annotated mesh, read once by mesh_vertices()
+VERTEX_CACHE = {}
+
+def mesh_vertices(mesh):
+    """
+    Returns the local vertex coordinates of a mesh, reading them only on first use.
+    
+    The coordinates are bulk-copied with foreach_get() and cached in VERTEX_CACHE,
+    since the annotated objects only move rigidly and their mesh data stays the same
+    across frames.
+    
+    Args:
+        mesh: Blender mesh data block
+        
+    Returns:
+        numpy.ndarray: A (V, 3) array of local vertex coordinates
+    """
+    coords = VERTEX_CACHE.get(mesh.name_full)
+    if coords is None:
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = VERTEX_CACHE[mesh.name_full] = coords.reshape(-1, 3)
+    return coords
+
+def create_data(projection, obj, class_label, label_index, rows):
+    """
+    Converts 3D object data to 2D bounding box annotations in YOLO format.
+    
+    Calculates the bounding box by projecting the object's vertices (or, for
+    LABEL_TYPE 'label_cuboid', the 8 corners of its bounding box) into camera space
+    in one vectorized pass (world_to_camera_view_batch).
+    Appends annotation row: (label_index, class, cx, cy, w, h)
+    
+    Args:
+        projection (tuple): Camera terms of the frame from camera_projection()
         obj: Blender object to annotate
-        label_save (dict): Dictionary with paths for saving labels
+        class_label (int): Class index written for the object
+        label_index (int): Label file index of the frame (frame + FRAME_OFFSET)
+        rows (list): Annotation rows of all frames, appended to
         
     Note:
-        Skips objects that are not visible in the camera view
+        Skips objects that are not visible in the camera view; objects whose bounding
+        box lies in front of the camera and entirely beside the frame are rejected
+        before any vertex is read. Objects behind the camera are projected like all
+        others (world_to_camera_view() mirrors them), as the labels always were
         Format: <class_idx> <center_x> <center_y> <width> <height>
         - All values are normalized between 0 and 1
         - The Y-axis is inverted for compatibility with computer vision conventions
     """
-    matrix = obj.matrix_world
-    mesh = obj.data
-
-    # Get 2D bbox from vertices
-    minX, maxX, minY, maxY = 1, 0, 1, 0
-    for vertex in mesh.vertices:
-        co = vertex.co
-        pos = bpy_extras.object_utils.world_to_camera_view(scene, camera, matrix @ co)
-        minX, maxX = min(minX, pos.x), max(maxX, pos.x)
-        minY, maxY = min(minY, pos.y), max(maxY, pos.y)
+    matrix = np.array(obj.matrix_world)
+
+    # Cull on the 8 bounding box corners before touching any vertex
+    corners = np.array(obj.bound_box, dtype=np.float32) @ matrix[:3, :3].T + matrix[:3, 3]
+    corner_pos = world_to_camera_view_batch(projection, corners)
+    if np.all(corner_pos[:, 2] > 0) and (np.any(corner_pos[:, :2].max(axis=0) <= 0) or
+                                         np.any(corner_pos[:, :2].min(axis=0) >= 1)):
+        return  # Entirely beside the camera frame, so no vertex can be inside either
+
+    # Project all points at once
+    if LABEL_TYPE == 'label_cuboid':
+        pos = corner_pos
+    else:
+        world = mesh_vertices(obj.data) @ matrix[:3, :3].T + matrix[:3, 3]
+        pos = world_to_camera_view_batch(projection, world)
+
+    # Get 2D bbox from projected points, one reduction per bound for both axes
+    minX, minY = np.minimum(pos[:, :2].min(axis=0), 1)
+    maxX, maxY = np.maximum(pos[:, :2].max(axis=0), 0)
 
     x_center_v = (minX + maxX) / 2
     y_center_v = 1 - (minY + maxY) / 2  # Invert Y-axis
@@ -471,19 +722,8 @@ def create_data(camera, scene, obj, label_save):
     if not (0 < x_center_v < 1 and 0 < y_center_v < 1):
         return  # Simply do nothing (there is nothing to add)
 
-    # Determine classification based on prefix
-    class_label = -1
-    for key in classification:
-        if obj.name.startswith(key):
-            class_label = classification[key]
-            break
-
-    # Write result
-    if class_label != -1:
-        with open(label_save['vertice_bbox'], 'a') as f:
-            f.write(f"{class_label} {x_center_v} {y_center_v} {width_v} {height_v} ")
-
-            f.write("\n")
+    # Add result
+    rows.append((label_index, class_label, x_center_v, y_center_v, width_v, height_v))
 
 def render_setup():
     """
@@ -495,22 +735,87 @@ def render_setup():
     sun_object = bpy.data.objects.get('Sun')
     sun_object.hide_render = HIDE_SUN
 
-def render_frame(scene, frame):
+def setup_renderer(scene):
+    """
+    Configures the render engine once before the frames are rendered.
+    
+    Persistent data is enabled so Cycles keeps the scene BVH and compiled shaders
+    between the frames of the render loop instead of rebuilding them per frame.
+    With --gpu on the command line, rendering switches to the GPU (enable_gpu()), so
+    each headless worker started by render_parallel.py renders on the GPU instead of
+    sharing the CPU.
+    
+    Args:
+        scene: Blender scene object
+        
+    Raises:
+        RuntimeError: If --gpu is given but Cycles finds no GPU device
+    """
+    scene.render.use_persistent_data = True
+
+    if ARGS.gpu:
+        enable_gpu(scene)
+
+def enable_gpu(scene):
+    """
+    Switches Cycles to the first backend in GPU_BACKENDS that has devices.
+    
+    Only the devices of that backend are enabled. The backend has to be chosen
+    explicitly: background runs (blender -b) start from the default preferences,
+    where the compute device type is 'NONE' and Cycles silently renders on the CPU
+    even with the scene device set to 'GPU'.
+    
+    Args:
+        scene: Blender scene object
+        
+    Returns:
+        str: The selected backend, e.g. 'OPTIX'
+        
+    Raises:
+        RuntimeError: If no backend has a device
+    """
+    cycles_preferences = bpy.context.preferences.addons['cycles'].preferences
+    for backend in GPU_BACKENDS:
+        try:
+            cycles_preferences.compute_device_type = backend
+        except TypeError:
+            # Backend not supported by this Blender build or platform
+            continue
+        cycles_preferences.refresh_devices()
+        devices = [device for device in cycles_preferences.devices if device.type == backend]
+        if devices:
+            break
+    else:
+        cycles_preferences.compute_device_type = 'NONE'
+        raise RuntimeError(f"No Cycles GPU device found (tried {', '.join(GPU_BACKENDS)})")
+
+    for device in cycles_preferences.devices:
+        device.use = device.type == backend
+    scene.cycles.device = 'GPU'
+
+    print(f"[INF] Rendering with {backend} on {', '.join(device.name for device in devices)}")
+    return backend
+
+def render_frame(scene, frame, filepath):
     """
     Renders a single frame and saves it to the output directory.
     
     Args:
         scene: Blender scene object
         frame (int): Frame number to render
+        filepath (str): Output image path for the frame
     """
     scene.frame_set(frame)
-    scene.render.filepath = f"render_result/{SETNAME}/{frame+FRAME_OFFSET}.jpg"
+    scene.render.filepath = filepath
     bpy.ops.render.render(write_still=True)
 
 def process_frames():
     """
     Main function to process all frames in the animation range.
     
+    The range is the scene's frame range unless --start-frame/--end-frame are given
+    on the command line (see parse_script_args()).
+    
     Performs the following operations:
     1. Creates necessary output directories
     2. Annotates frames if ENABLE_ANNOTATION is True
@@ -520,25 +825,122 @@ def process_frames():
     6. Cleans up temporary objects when done
     """
     scene = bpy.context.scene
-    start_frame = scene.frame_start
-    end_frame = scene.frame_end
+    start_frame = scene.frame_start if ARGS.start_frame is None else ARGS.start_frame
+    end_frame = scene.frame_end if ARGS.end_frame is None else ARGS.end_frame
 
     ensure_directories()
 
     if ENABLE_ANNOTATION:
+        rows = []
         for frame in range(start_frame, end_frame + 1):
-            annotate_frame(scene, frame)
+            annotate_frame(scene, frame, TARGETS, rows)
+        write_annotations(rows, start_frame, end_frame)
 
     if ENABLE_RENDER:
+        setup_renderer(scene)
+
         if ENABLE_RANDOM_LIGHTING:
             lights = create_lights(NUM_LIGHTS)
-            animate_lights(scene, lights, [obj for obj in bpy.data.objects if obj.name.startswith(tuple(classification.keys()))], start_frame, end_frame, ORBIT_DISTANCE)
+            animate_lights(scene, lights, [obj for obj, _ in TARGETS], start_frame, end_frame, ORBIT_DISTANCE)
 
         if ENABLE_RANDOM_BACKGROUND:
             animate_background(scene, start_frame, end_frame)
 
+        render_dir = f"render_result/{SETNAME}"
         for frame in range(start_frame, end_frame + 1):
-            render_frame(scene, frame)
+            render_frame(scene, frame, f"{render_dir}/{frame + FRAME_OFFSET}.jpg")
+
+        if ENABLE_RANDOM_LIGHTING:
+            clean_lights(NUM_LIGHTS)
+
+def link_annotations(source_setname, setnames, start_frame, end_frame):
+    """
+    Hardlinks the annotation files of one dataset into other datasets.
+    
+    Annotations only depend on the object poses, not on the background, so datasets
+    that differ only in their background share the same label files and packed boxes.
+    
+    Args:
+        source_setname (str): Dataset whose annotations were written by write_annotations()
+        setnames (list): Datasets that receive links to those files
+        start_frame (int): First annotated frame
+        end_frame (int): Last annotated frame
+        
+    Note:
+        Frames without visible objects have no label file; stale files of such frames
+        are removed from the other datasets too.
+    """
+    filenames = [f"boxes_{start_frame + FRAME_OFFSET}_{end_frame + FRAME_OFFSET}.npy"]
+    filenames += [f"{LABEL_TYPE}/{frame + FRAME_OFFSET}.txt" for frame in range(start_frame, end_frame + 1)]
+
+    for setname in setnames:
+        if setname == source_setname:
+            continue
+
+        for filename in filenames:
+            source = f"annotation/{source_setname}/{filename}"
+            target = f"annotation/{setname}/{filename}"
+            if os.path.exists(target):
+                os.remove(target)
+            if os.path.exists(source):
+                os.link(source, target)
+
+def process_patterns(patterns):
+    """
+    Processes all frames once for each background pattern in patterns.
+    
+    Only the background differs between the resulting datasets, so the pattern
+    independent work is done once:
+    1. Frames are annotated once and the label files are hardlinked into every
+       dataset (link_annotations())
+    2. Random lights are created and animated once and shared by all datasets
+    3. Per pattern, only the background is re-animated before its frames are rendered
+    
+    Args:
+        patterns (list): Background patterns, one dataset each (e.g. ['SOLID', 'NOISE'])
+        
+    Note:
+        Sets the BACKGROUND_PATTERN and SETNAME globals of each dataset while it is processed.
+    """
+    global BACKGROUND_PATTERN, SETNAME
+
+    scene = bpy.context.scene
+    start_frame = scene.frame_start if ARGS.start_frame is None else ARGS.start_frame
+    end_frame = scene.frame_end if ARGS.end_frame is None else ARGS.end_frame
+
+    setnames = []
+    for pattern in patterns:
+        BACKGROUND_PATTERN = pattern
+        SETNAME = compose_setname()
+        ensure_directories()
+        setnames.append(SETNAME)
+
+    if ENABLE_RENDER:
+        # Before annotating, so that a missing GPU fails before any work is done
+        setup_renderer(scene)
+
+    if ENABLE_ANNOTATION:
+        SETNAME = setnames[0]
+        rows = []
+        for frame in range(start_frame, end_frame + 1):
+            annotate_frame(scene, frame, TARGETS, rows)
+        write_annotations(rows, start_frame, end_frame)
+        link_annotations(setnames[0], setnames[1:], start_frame, end_frame)
+
+    if ENABLE_RENDER:
+        if ENABLE_RANDOM_LIGHTING:
+            lights = create_lights(NUM_LIGHTS)
+            animate_lights(scene, lights, [obj for obj, _ in TARGETS], start_frame, end_frame, ORBIT_DISTANCE)
+
+        for pattern, setname in zip(patterns, setnames):
+            BACKGROUND_PATTERN, SETNAME = pattern, setname
+
+            if ENABLE_RANDOM_BACKGROUND:
+                animate_background(scene, start_frame, end_frame)
+
+            render_dir = f"render_result/{SETNAME}"
+            for frame in range(start_frame, end_frame + 1):
+                render_frame(scene, frame, f"{render_dir}/{frame + FRAME_OFFSET}.jpg")
 
         if ENABLE_RANDOM_LIGHTING:
             clean_lights(NUM_LIGHTS)
@@ -556,13 +958,23 @@ NUM_LIGHTS = 5  # Number of lights for random lighting
 ORBIT_DISTANCE = 1.0  # Distance for orbiting lights
 HIDE_SUN = False
 FRAME_OFFSET = 0
+LABEL_TYPE = 'label_vertice' # 'label_vertice', 'label_cuboid'
+GPU_BACKENDS = ['OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI']  # Cycles GPU backends for --gpu, in order of preference
 
 # Classification mapping
 classification = {'oreo_biscuit': 0}
+CLASS_PATTERN = re.compile("|".join(re.escape(key) for key in sorted(classification, key=len, reverse=True)))
+
+# Command-line overrides (blender -b <file> -P annotate_n_render.py -- [options])
+ARGS = parse_script_args()
+RNG = np.random.default_rng(ARGS.seed)
+
+# Objects to annotate, collected once
+TARGETS = find_targets()
 
 # Execute the script
-#process_frames()
-for bgpatt_opt in ['SOLID', 'NOISE', 'VORONOI']:
-    BACKGROUND_PATTERN = bgpatt_opt
-    SETNAME = compose_setname()
-    process_frames()
+if ARGS.check_gpu:
+    enable_gpu(bpy.context.scene)
+else:
+    #process_frames()
+    process_patterns(['SOLID', 'NOISE', 'VORONOI'])
@@ -0,0 +1,149 @@
+"""
+Parallel Frame Renderer for annotate_n_render.py
+
+This script splits an animation's frame range into contiguous chunks and runs one
+headless Blender process per chunk, each executing annotate_n_render.py on its own
+frame range. Rendering is CPU/GPU heavy and every frame is independent once the
+lights and backgrounds are keyed, so the chunks scale with the number of processes.
+
+Usage:
+    python render_parallel.py --blend cookie_rand_3.blend --start 1 --end 2000 [OPTIONS]
+
+Options:
+    --blend PATH         Blender scene file to render (required)
+    --start N            First frame of the range (required)
+    --end N              Last frame of the range (required)
+    --workers N          Number of Blender processes (default: 4)
+    --blender PATH       Blender executable (default: 'blender')
+    --script PATH        Script run inside Blender (default: annotate_n_render.py next to this file)
+    --seed N             Base seed; chunk i uses seed + i (default: unseeded)
+    --gpu                Render every chunk with Cycles on the GPU
+
+Note:
+    Each process gets cpu_count / workers render threads so the processes do not
+    oversubscribe the CPU. With --gpu, one Blender process first checks that Cycles
+    finds a GPU, and nothing is rendered if it does not. Every process enables all
+    devices of the selected GPU backend, so use one worker per GPU.
+"""
+
+import argparse
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+def parse_args():
+    """
+    Parse command line arguments for the parallel renderer.
+
+    Returns:
+        argparse.Namespace: Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Render annotate_n_render.py frame chunks in parallel Blender processes")
+    parser.add_argument("--blend", type=str, required=True, help="Blender scene file to render")
+    parser.add_argument("--start", type=int, required=True, help="First frame of the range")
+    parser.add_argument("--end", type=int, required=True, help="Last frame of the range")
+    parser.add_argument("--workers", type=int, default=4, help="Number of Blender processes (default: 4)")
+    parser.add_argument("--blender", type=str, default="blender", help="Blender executable (default: 'blender')")
+    parser.add_argument("--script", type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "annotate_n_render.py"),
+                        help="Script run inside Blender (default: annotate_n_render.py)")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed; chunk i uses seed + i")
+    parser.add_argument("--gpu", action="store_true", help="Render every chunk with Cycles on the GPU")
+
+    args = parser.parse_args()
+
+    if args.end < args.start:
+        parser.error("--end must not be smaller than --start")
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    return args
+
+def split_frames(start, end, workers):
+    """
+    Split an inclusive frame range into contiguous, nearly equal chunks.
+
+    Args:
+        start (int): First frame of the range
+        end (int): Last frame of the range
+        workers (int): Maximum number of chunks
+
+    Returns:
+        list: List of (chunk_start, chunk_end) tuples, both inclusive
+    """
+    total = end - start + 1
+    workers = min(workers, total)
+    chunks = []
+    for i in range(workers):
+        chunk_start = start + total * i // workers
+        chunk_end = start + total * (i + 1) // workers - 1
+        chunks.append((chunk_start, chunk_end))
+    return chunks
+
+def check_gpu(args):
+    """
+    Check in a headless Blender process that Cycles finds a GPU for --gpu.
+
+    Without a GPU every worker would fail its GPU setup, so this is checked once
+    before any worker is started.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        bool: True if a GPU backend with devices was found
+    """
+    command = [args.blender, "-b", args.blend, "--python-exit-code", "1", "-P", args.script, "--", "--check-gpu"]
+    return subprocess.run(command).returncode == 0
+
+def render_chunk(args, chunk_index, chunk, threads):
+    """
+    Run one headless Blender process on a frame chunk.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+        chunk_index (int): Index of the chunk, used to derive its seed
+        chunk (tuple): (chunk_start, chunk_end) frame range, inclusive
+        threads (int): Render threads for the process
+
+    Returns:
+        int: Exit code of the Blender process
+    """
+    command = [args.blender, "-b", args.blend, "-t", str(threads), "--python-exit-code", "1", "-P", args.script, "--",
+               "--start-frame", str(chunk[0]), "--end-frame", str(chunk[1])]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed + chunk_index)]
+    if args.gpu:
+        command.append("--gpu")
+
+    print(f"[INF] Rendering frames {chunk[0]}-{chunk[1]}")
+    return subprocess.run(command).returncode
+
+def main():
+    """
+    Main function that splits the frame range and waits for all Blender processes.
+    """
+    args = parse_args()
+
+    if args.gpu and not check_gpu(args):
+        print("[ERR] Cycles found no GPU device, nothing rendered.")
+        raise SystemExit(1)
+
+    chunks = split_frames(args.start, args.end, args.workers)
+    threads = max(1, (os.cpu_count() or 1) // len(chunks))
+
+    # Threads only wait on the Blender subprocesses, which do the actual work
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        codes = list(executor.map(lambda item: render_chunk(args, item[0], item[1], threads), enumerate(chunks)))
+
+    failed = [chunk for chunk, code in zip(chunks, codes) if code != 0]
+    for chunk in failed:
+        print(f"[ERR] Frames {chunk[0]}-{chunk[1]} failed.")
+
+    if failed:
+        raise SystemExit(1)
+
+    print("[INF] All frames rendered.")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,109 @@
 import os
 import cv2
 import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
-def visualize_labels(dataset_name, output_dir):
+# JPEG settings of the visualized images; optimized Huffman tables make them smaller
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+
+def load_labels(label_path):
+    """
+    Load a YOLO label file as one array instead of parsing it line by line.
+    
+    Args:
+        label_path (str): Path to the label file
+        
+    Returns:
+        numpy.ndarray: An (N, 5) array of (class, x_center, y_center, width, height) rows
+        
+    Note:
+        Empty and whitespace-only files (images without objects) give no rows. Lines
+        with fewer than 5 values are skipped. Files mixing such lines with whole rows
+        fall back to parsing line by line.
+    """
+    with open(label_path, "r") as file:
+        lines = file.read().splitlines()
+
+    # Images without objects have empty label files, which loadtxt warns about
+    if not any(line.strip() for line in lines):
+        return np.empty((0, 5))
+
+    try:
+        labels = np.loadtxt(lines, ndmin=2)
+    except ValueError:
+        rows = [data[:5] for data in (line.split() for line in lines) if len(data) >= 5]
+        return np.array(rows, dtype=float).reshape(-1, 5)
+
+    if labels.shape[1] < 5:
+        return np.empty((0, 5))
+    return labels[:, :5]
+
+def read_file(path):
+    """
+    Read a whole file into memory.
+    
+    Args:
+        path (str): Path to the file
+        
+    Returns:
+        bytes: File content, or None if the file could not be read
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+def visualize_image(image_file, img_dir, lbl_dir, output_dir):
+    """
+    Draw the labels of one image and save the result.
+    
+    Reads, decodes, draws and encodes a single image, so that images can be
+    processed independently in worker processes.
+    
+    Args:
+        image_file (str): File name of the image
+        img_dir (str): Directory containing the image
+        lbl_dir (str): Directory containing the matching label file
+        output_dir (str): Directory where the visualized image will be saved
+    """
+    label_path = os.path.join(lbl_dir, image_file.replace(".jpg", ".txt"))
+
+    data = read_file(os.path.join(img_dir, image_file))
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if data else None
+    if image is None:
+        print(f"Could not read image {image_file}")
+        return
+
+    height, width, _ = image.shape
+
+    if not os.path.exists(label_path):
+        print(f"Label file not found for {image_file} in {lbl_dir}")
+        return
+
+    labels = load_labels(label_path)
+
+    # Denormalize all bounding boxes at once
+    centers, sizes = labels[:, 1:3], labels[:, 3:5]
+    scale = np.array([width, height])
+    boxes = np.hstack([(centers - sizes / 2) * scale, (centers + sizes / 2) * scale]).astype(np.int32)
+
+    for class_index, (x1, y1, x2, y2) in zip(labels[:, 0].astype(int), boxes.tolist()):
+        cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(image, f"Class {class_index}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+
+    # Encode in memory and write the bytes in one call
+    out_path = os.path.join(output_dir, image_file)
+    ok, buffer = cv2.imencode(".jpg", image, JPEG_PARAMS)
+    if not ok:
+        print(f"Could not encode image {image_file}")
+        return
+
+    with open(out_path, "wb") as file:
+        file.write(buffer.tobytes())
+
+def visualize_labels(dataset_name, output_dir, workers=None):
     """
     Visualize YOLO object detection labels on images.
     
@@ -10,55 +111,27 @@ def visualize_labels(dataset_name, output_dir):
     around detected objects and visualizing keypoints if they exist in the annotation.
     Each processed image is saved to the output directory with annotations overlaid.
     
+    Images are independent, so they are spread over a process pool (visualize_image()),
+    which keeps decoding, drawing and encoding busy on every core.
+    
     Args:
         dataset_name (str): Name of the dataset folder (e.g., 'oreo_dataset')
         output_dir (str): Directory where visualized images will be saved
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
     """
     image_dirs = [f"./{dataset_name}/train/images", f"./{dataset_name}/val/images"]
     label_dirs = [f"./{dataset_name}/train/labels", f"./{dataset_name}/val/labels"]
     os.makedirs(output_dir, exist_ok=True)
 
+    tasks = []
     for img_dir, lbl_dir in zip(image_dirs, label_dirs):
-        for image_file in os.listdir(img_dir):
-            if not image_file.endswith(".jpg"):
-                continue
-
-            image_path = os.path.join(img_dir, image_file)
-            label_path = os.path.join(lbl_dir, image_file.replace(".jpg", ".txt"))
-
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"Could not read image {image_file}")
-                continue
-
-            height, width, _ = image.shape
-
-            if not os.path.exists(label_path):
-                print(f"Label file not found for {image_file} in {lbl_dir}")
-                continue
-
-            with open(label_path, "r") as file:
-                lines = file.readlines()
-
-            for line in lines:
-                data = line.strip().split()
-                if len(data) < 5:
-                    continue
-
-                class_index = int(data[0])
-                x_center, y_center, w, h = map(float, data[1:5])
-
-                # Denormalize bounding box
-                x1 = int((x_center - w / 2) * width)
-                y1 = int((y_center - h / 2) * height)
-                x2 = int((x_center + w / 2) * width)
-                y2 = int((y_center + h / 2) * height)
-
-                cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                cv2.putText(image, f"Class {class_index}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        # One directory pass per image directory
+        with os.scandir(img_dir) as entries:
+            tasks += [(entry.name, img_dir, lbl_dir, output_dir) for entry in entries if entry.name.endswith(".jpg")]
 
-            out_path = os.path.join(output_dir, image_file)
-            cv2.imwrite(out_path, image)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Consume the results so that errors in the workers are raised here
+        list(executor.map(visualize_image, *zip(*tasks), chunksize=16))
 
     print(f"Visualized images are saved in {output_dir}")
 
@@ -70,6 +143,7 @@ if __name__ == "__main__":
     This block sets up command-line argument parsing for:
     - dataset: Name of the YOLO dataset to visualize (required)
     - outdir: Directory where visualized images will be saved (default: './result')
+    - workers: Number of worker processes (default: CPU count)
 
     Example usage:
         python check.py --dataset oreo_dataset --outdir ./visualization_results
@@ -77,6 +151,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Visualize YOLO labels: detection and optional keypoints.")
     parser.add_argument("--dataset", type=str, required=True, help="Dataset name (e.g., 'output')")
     parser.add_argument("--outdir", type=str, default="./result", help="Directory to save visualized images")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
 
     args = parser.parse_args()
-    visualize_labels(args.dataset, args.outdir)
+    visualize_labels(args.dataset, args.outdir, args.workers)
@@ -1,9 +1,19 @@
 import os
 import shutil
-import random
 import argparse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Content of the YOLO dataset YAML; it does not depend on the dataset
+YAML_CONTENT = b"""train: ./train/images
+val: ./val/images
+
+nc: 1
+names:
+0: cookie
+"""
+
 def parse_args():
     """
     Parse command line arguments for the dataset splitting script.
@@ -13,6 +23,8 @@ def parse_args():
     - dataset_name: Name for the output dataset folder and YAML file
     - split_ratio: Ratio for train/val split (default: 0.8)
     - label_type: Type of label format to use from available options
+    - seed: Seed for the random split (default: unseeded)
+    - move: Move images out of the source instead of linking/copying them
     
     Returns:
         argparse.Namespace: Parsed command-line arguments
@@ -24,6 +36,9 @@ def parse_args():
     parser.add_argument("--label_type", type=str, required=True, choices=[
         "label_vertice", "label_vertice_obscured", "label_cuboid", "label_cuboid_obscured"
     ], help="Type of label to use")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible split (default: unseeded)")
+    parser.add_argument("--move", action="store_true",
+                        help="Move images out of the source instead of linking/copying them (labels are always kept)")
     return parser.parse_args()
 
 def create_dirs(base_path):
@@ -63,15 +78,72 @@ def create_dirs(base_path):
         os.makedirs(path, exist_ok=True)
     return paths
 
-def split_and_copy_images(images_root, subdirs, split_ratio, output_paths):
+def place_file(src, dst, move=False):
+    """
+    Place a file at the destination, hardlinking it when possible.
+    
+    A hardlink is a single metadata operation, so no file content is copied. An
+    existing destination (e.g. from an earlier split) is replaced, and when linking
+    fails (e.g. source and destination are on different filesystems), the file is
+    copied instead.
+    
+    With move=True the file is moved instead: a rename on the same filesystem,
+    which is also a single metadata operation, or a copy and delete across
+    filesystems.
+    
+    Args:
+        src (str): Path of the source file
+        dst (str): Path of the destination file
+        move (bool, optional): If True, move the file instead. Defaults to False.
+        
+    Note:
+        Hardlinked files share their content with the source, so editing one in
+        place also changes the other.
+    """
+    if move:
+        try:
+            os.replace(src, dst)
+        except OSError:
+            shutil.move(src, dst)
+        return
+
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        # Unlink first, so a copy never writes through to a linked source file
+        os.remove(dst)
+        place_file(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+def place_files(pairs, workers=None, move=False):
+    """
+    Place many files concurrently with place_file().
+    
+    Placing files is bound by filesystem calls rather than Python, so a thread pool
+    keeps several of them in flight until the disk saturates.
+    
+    Args:
+        pairs (list): List of (src, dst) path tuples
+        workers (int, optional): Number of threads. Defaults to min(32, 4 * cpu_count).
+        move (bool, optional): If True, move the files instead. Defaults to False.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the results so that errors in the workers are raised here
+        list(executor.map(lambda pair: place_file(*pair, move=move), pairs))
+
+def split_and_copy_images(images_root, subdirs, split_ratio, output_paths, rng, move=False):
     """
     Split images from multiple subdirectories and copy them to train/val directories.
     
     For each subdirectory:
-    1. Lists all JPG images
-    2. Randomly shuffles the images
+    1. Lists all JPG images, sorted so a seeded split is reproducible
+    2. Randomly permutes the images
     3. Splits images according to the provided ratio
-    4. Copies to train/val directories with modified filenames that preserve source information
+    4. Places them in train/val directories with modified filenames that preserve source information
+    
+    The files of all subdirectories are placed at once on a thread pool (place_files()).
     
     Args:
         images_root (str): Root directory containing image subdirectories
@@ -80,27 +152,33 @@ def split_and_copy_images(images_root, subdirs, split_ratio, output_paths):
         output_paths (dict): Dictionary containing paths to output directories
             - train_images: Path where training images will be copied
             - val_images: Path where validation images will be copied
+        rng (numpy.random.Generator): Random number generator for the permutations
+        move (bool, optional): If True, move the images out of the source instead. Defaults to False.
     
     Notes:
         - Destination filenames are prefixed with subdirectory name: "{subdir}-{original_name}"
         - This naming scheme allows for tracking the image source while ensuring uniqueness
     """
+    pairs = []
     for subdir in subdirs:
         subdir_path = os.path.join(images_root, subdir)
-        images = [f for f in os.listdir(subdir_path) if f.endswith(".jpg")]
-        random.shuffle(images)
+        with os.scandir(subdir_path) as entries:
+            images = sorted(entry.name for entry in entries if entry.name.endswith(".jpg"))
+        order = rng.permutation(len(images))
 
         split_point = int(len(images) * split_ratio)
-        train_images = images[:split_point]
-        val_images = images[split_point:]
+        train_images = [images[i] for i in order[:split_point]]
+        val_images = [images[i] for i in order[split_point:]]
 
         for img in train_images:
             new_name = f"{subdir}-{img}"
-            shutil.copy(os.path.join(subdir_path, img), os.path.join(output_paths["train_images"], new_name))
+            pairs.append((os.path.join(subdir_path, img), os.path.join(output_paths["train_images"], new_name)))
 
         for img in val_images:
             new_name = f"{subdir}-{img}"
-            shutil.copy(os.path.join(subdir_path, img), os.path.join(output_paths["val_images"], new_name))
+            pairs.append((os.path.join(subdir_path, img), os.path.join(output_paths["val_images"], new_name)))
+
+    place_files(pairs, move=move)
 
 def copy_labels(images_dir, destination, label_root):
     """
@@ -109,7 +187,9 @@ def copy_labels(images_dir, destination, label_root):
     For each image file:
     1. Extracts the image ID from the filename
     2. Determines the corresponding label file path
-    3. Copies the label file to the destination with a matching name pattern
+    3. Places the label file in the destination with a matching name pattern
+    
+    All label files are placed at once on a thread pool (place_files()).
     
     This function handles special cases for background images:
     - Regular images use labels from {label_root}/{img_id}.txt
@@ -124,19 +204,38 @@ def copy_labels(images_dir, destination, label_root):
         The function expects image filenames in the format "{subdir}-{original_name}"
         where the original name contains the numeric ID used for label lookup.
     """
-    for img_file in os.listdir(images_dir):
-        if img_file.endswith(".jpg"):
+    # List the available labels once instead of checking every label file on disk
+    label_names = set()
+    if os.path.isdir(label_root):
+        with os.scandir(label_root) as entries:
+            label_names = {entry.name for entry in entries if entry.is_file()}
+
+    bg_label_file = os.path.join(os.path.dirname(label_root), "label_bg", "bg.txt")
+    has_bg_label = os.path.isfile(bg_label_file)
+
+    pairs = []
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            img_file = entry.name
+            if not img_file.endswith(".jpg"):
+                continue
+
             img_id = img_file.split("-")[-1].split(".")[0]
             subdir = img_file.split("-")[0]
 
             if "BG_" not in img_file:
+                if f"{img_id}.txt" not in label_names:
+                    continue
                 label_file = os.path.join(label_root, f"{img_id}.txt")
             else:
-                label_file = os.path.join(os.path.dirname(label_root), "label_bg", "bg.txt")
+                if not has_bg_label:
+                    continue
+                label_file = bg_label_file
+
+            new_label_name = f"{subdir}-{img_id}.txt"
+            pairs.append((label_file, os.path.join(destination, new_label_name)))
 
-            if os.path.exists(label_file):
-                new_label_name = f"{subdir}-{img_id}.txt"
-                shutil.copy(label_file, os.path.join(destination, new_label_name))
+    place_files(pairs)
 
 def generate_yaml(dataset_path, dataset_name):
     """
@@ -153,16 +252,13 @@ def generate_yaml(dataset_path, dataset_name):
     
     The resulting YAML file is saved as "{dataset_path}/{dataset_name}.yaml".
     """
-    yaml_content =f"""train: ./train/images
-val: ./val/images
-
-nc: 1
-names:
-0: cookie
-"""
     yaml_path = os.path.join(dataset_path, f"{dataset_name}.yaml")
-    with open(yaml_path, "w") as yaml_file:
-        yaml_file.write(yaml_content)
+    # Write the few bytes directly, without a buffered text file
+    fd = os.open(yaml_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, YAML_CONTENT)
+    finally:
+        os.close(fd)
 
 def main():
     """
@@ -197,15 +293,16 @@ def main():
     print(f"Label type: {label_type}")
     print(f"Saving to: {dataset_path}")
     print(f"Train/Val split ratio: {split_ratio}")
+    print(f"Split seed: {args.seed}")
 
     # Create output directories
     output_paths = create_dirs(dataset_path)
 
-    # Get list of subdirectories under images
-    subdirs = [d for d in os.listdir(images_root) if os.path.isdir(os.path.join(images_root, d))]
+    # Get list of subdirectories under images, sorted so a seeded split is reproducible
+    subdirs = sorted(d for d in os.listdir(images_root) if os.path.isdir(os.path.join(images_root, d)))
 
     # Copy images
-    split_and_copy_images(images_root, subdirs, split_ratio, output_paths)
+    split_and_copy_images(images_root, subdirs, split_ratio, output_paths, np.random.default_rng(args.seed), args.move)
 
     # Copy labels
     copy_labels(output_paths["train_images"], output_paths["train_labels"], labels_root)
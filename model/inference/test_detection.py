@@ -1,11 +1,18 @@
 import argparse
 import os
+import queue
+import sys
+import threading
 import cv2
 import numpy as np
 from ultralytics import YOLO
 
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
+# Batches/frames buffered between the reader, detection and writer threads
+QUEUE_SIZE = 4
+BOX_COLOR = (0, 255, 0)
+WINDOW_NAME = "YOLO Detection"
 
 def is_mp4_file(path):
     """
@@ -25,7 +32,251 @@ def is_mp4_file(path):
     # Check for file extensions
     return path.lower().endswith('mp4')
 
-def detect_stream(model_path, confidence, source, headless=False, output=None):
+def open_capture(source):
+    """
+    Open a video file or camera with backend settings suited to streaming detection.
+    
+    Video files are opened with the FFMPEG backend and hardware decoding (NVDEC, VAAPI,
+    ...) where available, then with FFMPEG software decoding, and finally with OpenCV's
+    default backend selection (e.g. for builds without FFMPEG or GStreamer pipeline
+    strings).
+    
+    Cameras (an index or a /dev/video* path) are opened with V4L2 on Linux, or the
+    default backend when V4L2 fails, and asked for MJPEG, which USB cameras deliver at
+    full frame rate and which decodes cheaply. They buffer only one frame, so every
+    prediction runs on the most recent frame instead of a stale one.
+    
+    Args:
+        source (str): Path to video file, camera index or camera device path
+        
+    Returns:
+        cv2.VideoCapture: The opened (or failed) capture
+    """
+    source = str(source)
+    if source.isdigit() or source.startswith("/dev/video"):
+        device = int(source) if source.isdigit() else source
+        cap = cv2.VideoCapture(device, cv2.CAP_V4L2) if sys.platform.startswith("linux") else None
+        if cap is None or not cap.isOpened():
+            cap = cv2.VideoCapture(device)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG,
+                           [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if cap.isOpened():
+        return cap
+
+    # Builds or devices that reject the hardware acceleration parameters
+    cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    if cap.isOpened():
+        print("[INF] Hardware decoding unavailable, decoding in software.")
+        return cap
+
+    # OpenCV builds without FFMPEG, GStreamer pipelines, ...
+    print("[INF] FFMPEG capture unavailable, falling back to the default backend.")
+    return cv2.VideoCapture(source)
+
+def open_writer(path, fps, size):
+    """
+    Open an H.264 video writer, using a hardware encoder where available.
+    
+    H.264 ('avc1') is encoded through FFMPEG, which offloads it to NVENC, VAAPI, etc.
+    when the build supports hardware acceleration. OpenCV builds without an H.264
+    encoder fall back to the software MPEG-4 ('mp4v') encoder.
+    
+    Args:
+        path (str): Output video path
+        fps (int): Frames per second of the output
+        size (tuple): (width, height) of the output frames
+        
+    Returns:
+        cv2.VideoWriter: The opened writer
+    """
+    writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*'avc1'), fps, size,
+                             [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if writer.isOpened():
+        return writer
+
+    print("[INF] H.264 encoder unavailable, falling back to MPEG-4.")
+    return cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+
+def read_frames(cap, frame_queue, stop_event, batch=1, stride=1):
+    """
+    Read batches of frames from a capture into a queue (reader thread).
+    
+    Args:
+        cap (cv2.VideoCapture): The opened capture
+        frame_queue (queue.Queue): Queue receiving lists of up to `batch` frames
+        stop_event (threading.Event): Set to stop reading early
+        batch (int, optional): Number of frames per list. Defaults to 1.
+        stride (int, optional): Only every stride-th frame is decoded and queued. Defaults to 1.
+        
+    Note:
+        None is queued once the stream ends, also when reading fails with an exception,
+        so the consumer knows when to stop.
+        Frames are decoded into a ring of reused buffers instead of a new array per
+        frame. The ring holds every frame that can be queued or in use at once, including
+        frames waiting for the writer thread and the display (detections are drawn in place).
+    """
+    # Buffers are allocated by the first retrieve into each slot, then reused
+    buffers = [None] * ((QUEUE_SIZE + 2) * batch + QUEUE_SIZE + 3)
+    frame_index = 0
+    decoded = 0
+    ended = False
+    try:
+        while not ended and not stop_event.is_set():
+            frames = []
+            while len(frames) < batch:
+                if not cap.grab():
+                    print("[ERR] Failed to read frame.")
+                    ended = True
+                    break
+
+                # Only decode the frames that are detected on
+                frame_index += 1
+                if (frame_index - 1) % stride:
+                    continue
+
+                slot = decoded % len(buffers)
+                ret, frame = cap.retrieve(buffers[slot])
+                if not ret:
+                    print("[ERR] Failed to decode frame.")
+                    ended = True
+                    break
+                buffers[slot] = frame
+                decoded += 1
+                frames.append(frame)
+
+            if frames:
+                put_until_stopped(frame_queue, frames, stop_event)
+    finally:
+        put_until_stopped(frame_queue, None, stop_event)
+
+def write_frames(writer, frame_queue, stop_event):
+    """
+    Write frames from a queue to a video writer (writer thread).
+    
+    Once the stop event is set, the frames still queued are written before returning.
+    The stop event is also set when writing fails, so producers stop waiting on the queue.
+    
+    Args:
+        writer (cv2.VideoWriter): The opened writer
+        frame_queue (queue.Queue): Queue of frames to write
+        stop_event (threading.Event): Set when no more frames will be queued
+    """
+    try:
+        while True:
+            try:
+                frame = frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                if stop_event.is_set():
+                    return
+                continue
+            writer.write(frame)
+    finally:
+        stop_event.set()
+
+def show_latest_frame(frame_queue):
+    """
+    Show the frame waiting in a one-slot queue, if any, and handle window events.
+    
+    HighGUI is not thread-safe (macOS aborts on GUI calls off the main thread), so this
+    is called from the detection loop on the main thread rather than from a worker.
+    
+    Args:
+        frame_queue (queue.Queue): Queue of frames to show, see offer_frame()
+        
+    Returns:
+        bool: True if 'q' was pressed to stop the stream
+    """
+    try:
+        cv2.imshow(WINDOW_NAME, frame_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return cv2.waitKey(1) & 0xFF == ord('q')
+
+def offer_frame(frame_queue, frame):
+    """
+    Put a frame into a one-slot queue without blocking, replacing a frame not yet taken.
+    
+    Args:
+        frame_queue (queue.Queue): Queue with maxsize=1
+        frame (numpy.ndarray): The frame
+    """
+    try:
+        frame_queue.get_nowait()
+    except queue.Empty:
+        pass
+    frame_queue.put_nowait(frame)
+
+def draw_detections(image, result):
+    """
+    Draw the detected boxes and their labels in place.
+    
+    Cheaper than result.plot(), which copies the frame and sets up an annotator for
+    every frame.
+    
+    Args:
+        image (numpy.ndarray): BGR frame the result was predicted on
+        result (ultralytics.engine.results.Results): Detection result of the frame
+        
+    Returns:
+        numpy.ndarray: The same image, with the detections drawn
+    """
+    boxes = result.boxes
+    corners = boxes.xyxy.cpu().numpy().astype(np.int32).tolist()
+    classes = boxes.cls.cpu().numpy().astype(int).tolist()
+    scores = boxes.conf.cpu().numpy().tolist()
+
+    for (x1, y1, x2, y2), class_index, score in zip(corners, classes, scores):
+        cv2.rectangle(image, (x1, y1), (x2, y2), BOX_COLOR, 2)
+        cv2.putText(image, f"{result.names[class_index]} {score:.2f}", (x1, max(y1 - 10, 10)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, BOX_COLOR, 1)
+    return image
+
+def start_worker(target, args, errors):
+    """
+    Start a daemon thread running target(*args).
+    
+    An exception raised in the thread is collected instead of being lost with the
+    thread, so the caller can raise it again once the thread is joined.
+    
+    Args:
+        target (callable): Function to run on the thread
+        args (tuple): Arguments of the function
+        errors (list): List the exception is appended to
+        
+    Returns:
+        threading.Thread: The started thread
+    """
+    def run():
+        try:
+            target(*args)
+        except Exception as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+def put_until_stopped(frame_queue, item, stop_event):
+    """
+    Put an item into a bounded queue, giving up once the stop event is set.
+    
+    Args:
+        frame_queue (queue.Queue): The queue
+        item: Item to put
+        stop_event (threading.Event): Event that cancels the put
+    """
+    while not stop_event.is_set():
+        try:
+            frame_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+def detect_stream(model_path, confidence, source, headless=False, output=None, half=False, batch=1, stride=1):
     """
     Run object detection on a video stream or file using a YOLO model.
     
@@ -33,19 +284,33 @@ def detect_stream(model_path, confidence, source, headless=False, output=None):
     on each frame using the provided YOLO model, and optionally displays or saves the 
     results with bounding box annotations.
     
+    Frames are read on a reader thread (read_frames()) and written on a writer thread
+    (write_frames()), connected by bounded queues. Detection and the display
+    (show_latest_frame()) stay on the calling thread, as HighGUI needs the main thread.
+    
     Args:
         model_path (str): Path to the YOLO model file
         confidence (float): Minimum confidence threshold for detections (0.0-1.0)
         source (str or int): Path to video file or camera index
         headless (bool, optional): If True, run without displaying GUI. Defaults to False.
         output (str, optional): Path to save output video. Defaults to None.
+        half (bool, optional): If True, run inference in FP16 (CUDA devices only). Defaults to False.
+        batch (int, optional): Number of frames passed to the model per predict call. Larger
+            batches use the GPU better but delay each frame until its batch is full, so keep
+            1 for live cameras. Defaults to 1.
+        stride (int, optional): Run detection on every stride-th frame only. Skipped frames
+            are grabbed but never decoded. Defaults to 1.
         
     Note:
         - Press 'q' to quit the stream when display is enabled
         - Stream will end when video file ends or camera disconnects
     """
     model = YOLO(model_path)
-    cap = cv2.VideoCapture(source)
+    # Warm up on a blank batch, so model setup and kernel selection happen before the stream
+    blank = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+    model.predict([blank] * batch, conf=confidence, imgsz=(FRAME_WIDTH, FRAME_HEIGHT), half=half, verbose=False)
+
+    cap = open_capture(source)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
 
@@ -55,34 +320,63 @@ def detect_stream(model_path, confidence, source, headless=False, output=None):
 
     writer = None
     if output and is_mp4_file(source):
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
+        # Only every stride-th frame is written, keep the playback speed
+        fps = max(1, int(cap.get(cv2.CAP_PROP_FPS) / stride))
         size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
-        writer = cv2.VideoWriter(output, fourcc, fps, size)
+        writer = open_writer(output, fps, size)
+
+    # Drawing the results is only needed when they are shown or saved
+    need_plot = not headless or writer is not None
+
+    # Decoding and encoding run on their own threads, so they overlap with detection
+    stop_event = threading.Event()
+    errors = []
+    read_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    write_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    # The display only ever shows the latest frame, so it never holds back detection
+    display_queue = queue.Queue(maxsize=1)
+    reader = writer_thread = None
 
     print("[INF] Starting detection stream...")
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("[ERR] Failed to read frame.")
+        reader = start_worker(read_frames, (cap, read_queue, stop_event, batch, stride), errors)
+        if writer:
+            writer_thread = start_worker(write_frames, (writer, write_queue, stop_event), errors)
+        if not headless:
+            cv2.namedWindow(WINDOW_NAME)
+
+        while not stop_event.is_set():
+            # Time out regularly, so the window stays responsive while waiting for frames
+            if not headless and show_latest_frame(display_queue):
+                break
+            try:
+                frames = read_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if frames is None:
                 break
 
-            results = model.predict(frame, conf=confidence, imgsz=(FRAME_WIDTH, FRAME_HEIGHT))
-            annotated = results[0].plot()
+            results = model.predict(frames, conf=confidence, imgsz=(FRAME_WIDTH, FRAME_HEIGHT), half=half,
+                                    verbose=False)
 
-            if not headless:
-                cv2.imshow("YOLO Detection", annotated)
+            if not need_plot:
+                continue
 
-            if writer:
-                writer.write(annotated)
+            for frame, result in zip(frames, results):
+                annotated = draw_detections(frame, result)
 
-            if not headless:
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    break
+                if not headless:
+                    offer_frame(display_queue, annotated)
+
+                if writer:
+                    put_until_stopped(write_queue, annotated, stop_event)
 
     finally:
+        # The writer finishes the queued frames before it returns
+        stop_event.set()
+        for thread in (reader, writer_thread):
+            if thread:
+                thread.join()
         cap.release()
         if writer:
             writer.release()
@@ -90,6 +384,9 @@ def detect_stream(model_path, confidence, source, headless=False, output=None):
             cv2.destroyAllWindows()
         print("[INF] Stream ended.")
 
+    if errors:
+        raise errors[0]
+
 def parse_args():
     """
     Parse command line arguments for the YOLO detection script.
@@ -100,6 +397,9 @@ def parse_args():
     - input: Video source (file path or camera index)
     - output: Optional path to save output video
     - headless: Flag to run without GUI display
+    - half: Flag to run inference in FP16
+    - batch: Number of frames per inference call
+    - stride: Detect on every n-th frame only
     
     Returns:
         argparse.Namespace: Parsed command-line arguments
@@ -110,10 +410,21 @@ def parse_args():
     parser = argparse.ArgumentParser(description="YOLO Object Detection Stream")
     parser.add_argument("--detector", required=True, help="Path to YOLO model (e.g., yolov8.pt)")
     parser.add_argument("--confidence", type=float, default=0.7, help="Minimum confidence threshold")
-    parser.add_argument("--input", required=True, help="Camera index or path to video file")
+    parser.add_argument("--input", required=True, help="Camera index, camera device (/dev/videoN) or path to video file")
     parser.add_argument("--output", help="Output video path (optional)")
     parser.add_argument("--headless", action="store_true", help="Run without GUI display")
-    return parser.parse_args()
+    parser.add_argument("--half", action="store_true", help="Run inference in FP16 (CUDA devices only)")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per inference call (default: 1)")
+    parser.add_argument("--stride", type=int, default=1, help="Detect on every n-th frame only (default: 1)")
+
+    args = parser.parse_args()
+
+    if args.batch < 1:
+        parser.error("--batch must be at least 1")
+    if args.stride < 1:
+        parser.error("--stride must be at least 1")
+
+    return args
 
 def main():
     """
@@ -129,7 +440,8 @@ def main():
         3. Display and/or save results based on provided options
     """
     args = parse_args()
-    detect_stream(args.detector, args.confidence, args.input, args.headless, args.output)
+    detect_stream(args.detector, args.confidence, args.input, args.headless, args.output, args.half, args.batch,
+                  args.stride)
 
 if __name__ == "__main__":
     main()
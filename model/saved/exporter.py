@@ -14,7 +14,8 @@ Options:
     --int8               Enable int8 quantization
     --data PATH          Path to dataset YAML file (required for int8 quantization)
     --output PATH        Output file path (default: derived from model name)
-    --fraction           Fraction of data used for model export (default: 1.0)
+    --fraction           Fraction of the dataset used for int8 calibration (default: 0.1)
+    --nms                Include non-maximum suppression in the exported model
     --device DEVICE      Device to run on, e.g. 'cpu' or '0' (default: auto-detect)
 
 Examples:
@@ -46,7 +47,9 @@ def parse_args():
     parser.add_argument("--int8", action="store_true", help="Enable int8 quantization")
     parser.add_argument("--data", type=str, default=None, help="Path to dataset YAML (required for int8 quantization)")
     parser.add_argument("--output", type=str, default=None, help="Output file path")
-    parser.add_argument("--fraction", type=float, default=1.0, help="Fraction of data used for model export (default: 1.0)")
+    parser.add_argument("--fraction", type=float, default=0.1,
+                        help="Fraction of the dataset used for int8 calibration (default: 0.1)")
+    parser.add_argument("--nms", action="store_true", help="Include non-maximum suppression in the exported model")
     parser.add_argument("--device", type=str, default="", help="Device to run on, e.g. 'cpu' or '0'")
     
     args = parser.parse_args()
@@ -61,6 +64,9 @@ def parse_args():
     if args.int8 and not args.data:
         parser.error("--data is required when using --int8 quantization")
     
+    if not 0.0 < args.fraction <= 1.0:
+        parser.error("--fraction must be in (0, 1]")
+    
     if args.data and not os.path.exists(args.data):
         parser.error(f"Dataset file not found: {args.data}")
     
@@ -90,6 +96,10 @@ def main():
     
     print(f"Exporting model to {args.output}")
     print(f"Configuration: size={args.imgsz}, half={args.half}, int8={args.int8}, nms={args.nms}")
+    if args.int8:
+        # Calibration quality levels off after a few hundred images, so a fraction
+        # of the dataset is enough and exports much faster than the full set
+        print(f"Calibrating int8 on {args.fraction:.0%} of the dataset")
     
     # Export the model
     model.export(
@@ -98,6 +108,7 @@ def main():
         half=args.half,
         int8=args.int8,
         data=args.data,
+        fraction=args.fraction,
         nms=args.nms,
         device=args.device,
         output=args.output